@@ -1,32 +1,57 @@
-from nicegui import ui
+from nicegui import app, ui
 import httpx
 import asyncio
+import json
 
 # FastAPIサーバーのURL
 API_URL = "http://localhost:8000"
 
+# 共有HTTPクライアント（接続プールを再利用するため、リクエストごとに作成しない）
+http_client: httpx.AsyncClient = None
+
 # グローバル変数で結果を保持
 result_text = None
 status_label = None
 
 
+def create_http_client():
+    """共有HTTPクライアントを作成（アプリ起動時に1回だけ）"""
+    global http_client
+    http_client = httpx.AsyncClient(
+        base_url=API_URL,
+        timeout=5.0,
+        http2=True,  # 1接続で複数リクエストを多重化
+        headers={"Accept-Encoding": "br, gzip"},
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
+
+
+async def close_http_client():
+    """共有HTTPクライアントを閉じる（アプリ終了時）"""
+    if http_client is not None:
+        await http_client.aclose()
+
+
+app.on_startup(create_http_client)
+app.on_shutdown(close_http_client)
+
+
 async def call_api(endpoint: str = "/"):
     """FastAPIエンドポイントを呼び出す"""
     global result_text, status_label
-    
+
     try:
         status_label.text = "リクエスト送信中..."
         status_label.classes("text-blue-500")
-        
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{API_URL}{endpoint}")
-            response.raise_for_status()
-            data = response.json()
-            
-            # 結果を表示
-            result_text.text = f"レスポンス:\n{data}"
-            status_label.text = f"成功 (ステータス: {response.status_code})"
-            status_label.classes("text-green-500")
+
+        response = await http_client.get(endpoint)
+        response.raise_for_status()
+        data = response.json()
+
+        # 結果を表示
+        result_text.text = f"レスポンス:\n{data}"
+        status_label.text = f"成功 (ステータス: {response.status_code})"
+        status_label.classes("text-green-500")
             
     except httpx.ConnectError:
         result_text.text = "エラー: FastAPIサーバーに接続できません。\nサーバーが起動しているか確認してください。"
@@ -47,6 +72,33 @@ def send_request(endpoint: str = "/"):
     asyncio.create_task(call_api(endpoint))
 
 
+async def run_batch(endpoints: list):
+    """複数エンドポイントをasyncio.gatherで並行リクエストし、結果をまとめて表示"""
+    global result_text, status_label
+
+    status_label.text = f"{len(endpoints)}件を並行リクエスト中..."
+    status_label.classes("text-blue-500")
+
+    responses = await asyncio.gather(
+        *(http_client.get(endpoint) for endpoint in endpoints),
+        return_exceptions=True
+    )
+
+    lines = []
+    success_count = 0
+    for endpoint, response in zip(endpoints, responses):
+        if isinstance(response, Exception):
+            lines.append(f"{endpoint}: エラー ({response})")
+        else:
+            success_count += 1
+            lines.append(f"{endpoint}: {response.status_code} {response.json()}")
+
+    # UIの更新はgather完了後に1回だけ行う
+    result_text.text = "\n".join(lines)
+    status_label.text = f"完了 ({success_count}/{len(endpoints)} 成功)"
+    status_label.classes("text-green-500" if success_count == len(endpoints) else "text-red-500")
+
+
 def create_navigation():
     """ナビゲーションバーを作成"""
     with ui.row().classes("w-full bg-blue-600 text-white p-4 gap-4 shadow-lg"):
@@ -105,6 +157,7 @@ def api_test_page():
         with ui.row().classes("gap-4 mb-4"):
             ui.button("Hello World (/)", on_click=lambda: send_request("/")).classes("bg-blue-500 hover:bg-blue-600 text-white px-6 py-2 rounded")
             ui.button("Health Check (/health)", on_click=lambda: send_request("/health")).classes("bg-green-500 hover:bg-green-600 text-white px-6 py-2 rounded")
+            ui.button("すべて実行", on_click=lambda: asyncio.create_task(run_batch(["/", "/health", "/ai/models", "/api/items/"]))).classes("bg-orange-500 hover:bg-orange-600 text-white px-6 py-2 rounded")
         
         # カスタムエンドポイント入力
         with ui.row().classes("w-full gap-2 mb-4"):
@@ -126,34 +179,61 @@ def ai_models_page():
     
     create_navigation()
     
-    models_result = ui.label("読み込み中...").classes("bg-gray-100 p-4 rounded border")
-    
+    state = {"models": None, "error": None}
+
+    @ui.refreshable
+    def render_models():
+        """モデル一覧を描画（refresh時に1回のバッチ更新で差し替え）"""
+        if state["error"] is not None:
+            ui.label(f"エラー: {state['error']}").classes("bg-gray-100 p-4 rounded border")
+        elif state["models"] is None:
+            ui.label("読み込み中...").classes("bg-gray-100 p-4 rounded border")
+        else:
+            with ui.column().classes("gap-2"):
+                for model in state["models"]:
+                    with ui.card().classes("p-4"):
+                        ui.label(model.get("name", "Unknown")).classes("text-xl font-bold")
+                        ui.label(model.get("description", "")).classes("text-gray-600")
+                        ui.label(f"ID: {model.get('id', '')}").classes("text-sm text-gray-500")
+
     async def load_models():
-        """AIモデル一覧を読み込む"""
+        """AIモデル一覧をSSEストリームで受信する"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{API_URL}/ai/models")
+            async with http_client.stream("GET", "/ai/models/stream", timeout=None) as response:
                 response.raise_for_status()
-                data = response.json()
-                
-                models_result.text = ""
-                with models_result:
-                    models_result.text = ""
-                    with ui.column().classes("gap-2"):
-                        for model in data.get("models", []):
-                            with ui.card().classes("p-4"):
-                                ui.label(model.get("name", "Unknown")).classes("text-xl font-bold")
-                                ui.label(model.get("description", "")).classes("text-gray-600")
-                                ui.label(f"ID: {model.get('id', '')}").classes("text-sm text-gray-500")
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue  # キープアライブやイベントIDの行はスキップ
+                    data = json.loads(line[len("data:"):].strip())
+                    state["models"] = data.get("models", [])
+                    state["error"] = None
+                    render_models.refresh()
         except Exception as e:
-            models_result.text = f"エラー: {str(e)}"
-    
-    asyncio.create_task(load_models())
-    
+            state["error"] = str(e)
+            render_models.refresh()
+
+    # ストリームは終了しないタスクのため、ページごとに1本だけ保持する。
+    # 再読み込みは前のタスクをキャンセルしてから張り直し、
+    # クライアント切断時にもキャンセルして接続リークを防ぐ
+    stream_task = {"task": None}
+
+    def start_stream():
+        if stream_task["task"] is not None:
+            stream_task["task"].cancel()
+        stream_task["task"] = asyncio.create_task(load_models())
+
+    def stop_stream():
+        if stream_task["task"] is not None:
+            stream_task["task"].cancel()
+            stream_task["task"] = None
+
+    ui.context.client.on_disconnect(stop_stream)
+    start_stream()
+
     with ui.column().classes("w-full max-w-4xl mx-auto p-8 gap-4"):
         ui.label("AI モデル一覧").classes("text-3xl font-bold mb-4")
-        ui.button("再読み込み", on_click=lambda: asyncio.create_task(load_models())).classes("bg-blue-500 hover:bg-blue-600 text-white px-6 py-2 rounded mb-4")
-        models_result
+        ui.button("再読み込み", on_click=start_stream).classes("bg-blue-500 hover:bg-blue-600 text-white px-6 py-2 rounded mb-4")
+        render_models()
 
 
 @ui.page("/items")
@@ -163,36 +243,63 @@ def items_page():
     
     create_navigation()
     
-    items_result = ui.label("").classes("bg-gray-100 p-4 rounded border")
-    
+    state = {"data": None, "error": None}
+
+    @ui.refreshable
+    def render_items():
+        """アイテム一覧を描画（refresh時に1回のバッチ更新で差し替え）"""
+        if state["error"] is not None:
+            ui.label(f"エラー: {state['error']}").classes("bg-gray-100 p-4 rounded border")
+        elif state["data"] is None:
+            ui.label("読み込み中...").classes("bg-gray-100 p-4 rounded border")
+        else:
+            data = state["data"]
+            ui.label(f"アイテム数: {data.get('total', 0)}").classes("text-lg font-semibold mb-2")
+            if data.get("items"):
+                with ui.column().classes("gap-2"):
+                    for item in data.get("items", []):
+                        with ui.card().classes("p-4"):
+                            ui.label(f"ID: {item.get('id', 'N/A')}").classes("font-bold")
+            else:
+                ui.label("アイテムがありません").classes("text-gray-500")
+
     async def load_items():
-        """アイテム一覧を読み込む"""
+        """アイテム一覧をSSEストリームで受信する"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{API_URL}/api/items/")
+            async with http_client.stream("GET", "/api/items/stream", timeout=None) as response:
                 response.raise_for_status()
-                data = response.json()
-                
-                items_result.text = ""
-                with items_result:
-                    items_result.text = ""
-                    ui.label(f"アイテム数: {data.get('total', 0)}").classes("text-lg font-semibold mb-2")
-                    if data.get("items"):
-                        with ui.column().classes("gap-2"):
-                            for item in data.get("items", []):
-                                with ui.card().classes("p-4"):
-                                    ui.label(f"ID: {item.get('id', 'N/A')}").classes("font-bold")
-                    else:
-                        ui.label("アイテムがありません").classes("text-gray-500")
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue  # キープアライブやイベントIDの行はスキップ
+                    state["data"] = json.loads(line[len("data:"):].strip())
+                    state["error"] = None
+                    render_items.refresh()
         except Exception as e:
-            items_result.text = f"エラー: {str(e)}"
-    
-    asyncio.create_task(load_items())
-    
+            state["error"] = str(e)
+            render_items.refresh()
+
+    # ストリームは終了しないタスクのため、ページごとに1本だけ保持する。
+    # 再読み込みは前のタスクをキャンセルしてから張り直し、
+    # クライアント切断時にもキャンセルして接続リークを防ぐ
+    stream_task = {"task": None}
+
+    def start_stream():
+        if stream_task["task"] is not None:
+            stream_task["task"].cancel()
+        stream_task["task"] = asyncio.create_task(load_items())
+
+    def stop_stream():
+        if stream_task["task"] is not None:
+            stream_task["task"].cancel()
+            stream_task["task"] = None
+
+    ui.context.client.on_disconnect(stop_stream)
+    start_stream()
+
     with ui.column().classes("w-full max-w-4xl mx-auto p-8 gap-4"):
         ui.label("アイテム管理").classes("text-3xl font-bold mb-4")
-        ui.button("再読み込み", on_click=lambda: asyncio.create_task(load_items())).classes("bg-blue-500 hover:bg-blue-600 text-white px-6 py-2 rounded mb-4")
-        items_result
+        ui.button("再読み込み", on_click=start_stream).classes("bg-blue-500 hover:bg-blue-600 text-white px-6 py-2 rounded mb-4")
+        render_items()
 
 
 if __name__ in {"__main__", "__mp_main__"}:
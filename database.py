@@ -1,6 +1,8 @@
 """LanceDB接続管理モジュール"""
-import lancedb
+import functools
+import importlib
 import os
+import threading
 from pathlib import Path
 
 # データベースディレクトリ
@@ -10,18 +12,30 @@ DB_DIR.mkdir(parents=True, exist_ok=True)
 # グローバル接続インスタンス
 _db_connection = None
 
+# 初回接続時の競合を防ぐロック（asyncや複数スレッドからの同時初期化対策）
+_connection_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _lazy_lancedb():
+    """lancedbを遅延インポート（pyarrowを含み起動が重いため初回利用時に読み込む）"""
+    return importlib.import_module("lancedb")
+
 
 def get_db_connection(uri: str = None):
     """LanceDB接続を取得（シングルトン）"""
     global _db_connection
-    
+
     if _db_connection is None:
-        if uri is None:
-            # デフォルトはローカルディレクトリ
-            uri = str(DB_DIR.absolute())
-        
-        _db_connection = lancedb.connect(uri)
-    
+        with _connection_lock:
+            # ロック待ちの間に他スレッドが初期化した可能性があるため再確認
+            if _db_connection is None:
+                if uri is None:
+                    # デフォルトはローカルディレクトリ
+                    uri = str(DB_DIR.absolute())
+
+                _db_connection = _lazy_lancedb().connect(uri)
+
     return _db_connection
 
 
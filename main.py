@@ -1,18 +1,38 @@
-import queue
+from contextlib import asynccontextmanager
+
+import orjson
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.middleware.gzip import GZipMiddleware
 
 from routers import items, health, ai, db, queue
-from sqlite_db import ensure_table_exists
+from sqlite_db import ensure_table_exists, init_pool, close_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """アプリのライフサイクルに合わせてSQLite接続プールを管理する
+
+    import時の副作用（DBファイル作成・接続確保）をなくし、
+    起動時に1回だけ初期化、終了時に接続を確実に閉じる。
+    """
+    init_pool()
+    # SQLite3テーブルの存在確認と作成
+    ensure_table_exists("file_processing_queue", "sql/file_processing_queue.sql")
+    yield
+    close_pool()
+
 
 app = FastAPI(
     title="Knowledge Tools API",
     description="FastAPI初期プロジェクト",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# SQLite3テーブルの存在確認と作成
-ensure_table_exists("file_processing_queue", "sql/file_processing_queue.sql")
+# 大きめのJSONレスポンスを圧縮して転送量を削減
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # ルーターを登録
 app.include_router(items.router)
@@ -22,8 +42,12 @@ app.include_router(db.router)
 app.include_router(queue.router)
 
 
+# ルートのレスポンスは固定内容なので、起動時に1回だけエンコードしておく
+_ROOT_RESPONSE = orjson.dumps({"message": "Hello World"})
+
+
 @app.get("/")
 async def root():
     """ルートエンドポイント"""
-    return {"message": "Hello World"}
+    return Response(content=_ROOT_RESPONSE, media_type="application/json")
 
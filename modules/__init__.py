@@ -3,6 +3,7 @@ from .file_read import (
     FileMetadata,
     get_file_metadata,
     calculate_file_hash,
+    ensure_file_hash,
     get_file_owner,
     read_file_content,
     read_file_binary,
@@ -15,7 +16,8 @@ from .excel_read import (
     read_excel_file,
     read_excel_simple,
     get_excel_metadata,
-    extract_excel_to_chunks
+    extract_excel_to_chunks,
+    close_all_excel_caches
 )
 from .word_read import (
     WordFileData,
@@ -23,17 +25,24 @@ from .word_read import (
     WordTableData,
     WordTableRowData,
     read_word_file,
+    read_many_word,
     read_word_simple,
     get_word_metadata,
-    extract_word_to_chunks
+    extract_word_to_chunks,
+    clear_word_cache
 )
 from .text_read import (
     TextFileData,
     TextChunkData,
+    TextChunkBatch,
     read_text_file,
+    read_text_file_async,
+    read_text_files_async,
+    read_many_text,
     read_text_file_simple,
     read_text_file_lines,
     extract_text_to_chunks,
+    extract_text_to_chunks_fast,
     read_text_file_by_lines,
     detect_encoding,
     is_text_file
@@ -43,6 +52,7 @@ __all__ = [
     "FileMetadata",
     "get_file_metadata",
     "calculate_file_hash",
+    "ensure_file_hash",
     "get_file_owner",
     "read_file_content",
     "read_file_binary",
@@ -54,20 +64,28 @@ __all__ = [
     "read_excel_simple",
     "get_excel_metadata",
     "extract_excel_to_chunks",
+    "close_all_excel_caches",
     "WordFileData",
     "WordParagraphData",
     "WordTableData",
     "WordTableRowData",
     "read_word_file",
+    "read_many_word",
     "read_word_simple",
     "get_word_metadata",
     "extract_word_to_chunks",
+    "clear_word_cache",
     "TextFileData",
     "TextChunkData",
+    "TextChunkBatch",
     "read_text_file",
+    "read_text_file_async",
+    "read_text_files_async",
+    "read_many_text",
     "read_text_file_simple",
     "read_text_file_lines",
     "extract_text_to_chunks",
+    "extract_text_to_chunks_fast",
     "read_text_file_by_lines",
     "detect_encoding",
     "is_text_file"
@@ -1,11 +1,25 @@
 """Excelファイル読み込みとテキスト抽出モジュール"""
 import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
 from pydantic import BaseModel, Field
 
+# シート並列抽出を有効にする最小ファイルサイズ（バイト）
+_PARALLEL_MIN_FILE_SIZE = 1024 * 1024
+
+# OOXMLの名前空間
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL_ATTR = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# セル参照（"A1"など）の列文字と行番号を分離するパターン
+_CELL_REF_RE = re.compile(r"([A-Z]+)(\d+)")
+
 
 class ExcelRowData(BaseModel):
     """Excel行データのPydanticモデル"""
@@ -46,6 +60,48 @@ class ExcelFileData(BaseModel):
         }
 
 
+# pd.ExcelFileハンドルのキャッシュ: (絶対パス, mtime_ns) -> ExcelFile
+# 同じファイルへの連続アクセスでzip展開とworkbook.xmlの再パースを省く
+_excel_file_cache = OrderedDict()
+_EXCEL_CACHE_MAX = 8
+
+
+def _cached_excel_file(file_path: str):
+    """
+    キャッシュされたpd.ExcelFileハンドルを取得
+
+    キーにmtime_nsを含めるため、ファイルが更新されると自動的に
+    新しいハンドルが作られる（古いものはLRUで追い出し時にclose）。
+
+    Args:
+        file_path: Excelファイルのパス
+
+    Returns:
+        pd.ExcelFileハンドル
+    """
+    import pandas as pd
+
+    key = (os.path.abspath(file_path), os.stat(file_path).st_mtime_ns)
+    excel_file = _excel_file_cache.get(key)
+    if excel_file is not None:
+        _excel_file_cache.move_to_end(key)
+        return excel_file
+
+    excel_file = pd.ExcelFile(file_path, engine='openpyxl')
+    _excel_file_cache[key] = excel_file
+    if len(_excel_file_cache) > _EXCEL_CACHE_MAX:
+        _, oldest = _excel_file_cache.popitem(last=False)
+        oldest.close()
+    return excel_file
+
+
+def close_all_excel_caches():
+    """キャッシュ中のExcelFileハンドルをすべて閉じる（終了処理用）"""
+    while _excel_file_cache:
+        _, excel_file = _excel_file_cache.popitem()
+        excel_file.close()
+
+
 def read_excel_file(file_path: str, sheet_name: Optional[str] = None) -> ExcelFileData:
     """
     Excelファイルを読み込んでテキスト情報を抽出
@@ -77,16 +133,20 @@ def read_excel_file(file_path: str, sheet_name: Optional[str] = None) -> ExcelFi
     try:
         # Excelファイルを読み込む
         if sheet_name:
-            # 指定されたシートのみ読み込む
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl')
+            # 指定されたシートのみ読み込む（ハンドルはキャッシュを共有）
+            df = pd.read_excel(_cached_excel_file(file_path), sheet_name=sheet_name)
             sheets_data = {sheet_name: _extract_dataframe_text(df)}
+        elif _should_parallelize(path):
+            # 大きな複数シートのファイルは、シートごとにワーカープロセスで並列抽出
+            sheet_names = _cached_excel_file(file_path).sheet_names
+
+            with ProcessPoolExecutor(max_workers=min(len(sheet_names), os.cpu_count() or 1)) as executor:
+                results = executor.map(_extract_sheet, [file_path] * len(sheet_names), sheet_names)
+                sheets_data = dict(results)
         else:
-            # 全シートを読み込む
-            excel_file = pd.ExcelFile(file_path, engine='openpyxl')
-            sheets_data = {}
-            for sheet in excel_file.sheet_names:
-                df = pd.read_excel(excel_file, sheet_name=sheet)
-                sheets_data[sheet] = _extract_dataframe_text(df)
+            # 全シートを1回のパースでまとめて読み込む（シートごとの再パースを回避）
+            dfs = pd.read_excel(_cached_excel_file(file_path), sheet_name=None)
+            sheets_data = {sheet: _extract_dataframe_text(df) for sheet, df in dfs.items()}
         
         # sheets_dataは既にExcelSheetDataインスタンスの辞書
         return ExcelFileData(
@@ -101,6 +161,44 @@ def read_excel_file(file_path: str, sheet_name: Optional[str] = None) -> ExcelFi
         raise ValueError(f"Excelファイルの読み込みエラー: {str(e)}")
 
 
+def _should_parallelize(path: Path) -> bool:
+    """
+    シートの並列抽出を行うべきか判定
+
+    小さいファイルではプロセス起動コストが上回るため、
+    複数シートかつ1MB超のファイルのみ並列化する。
+    """
+    if path.stat().st_size <= _PARALLEL_MIN_FILE_SIZE:
+        return False
+
+    try:
+        import openpyxl
+        wb = openpyxl.load_workbook(str(path), read_only=True)
+        try:
+            return len(wb.sheetnames) > 1
+        finally:
+            wb.close()
+    except Exception:
+        return False
+
+
+def _extract_sheet(file_path: str, sheet_name: str):
+    """
+    ワーカープロセス用: 1シートを読み込んでテキスト抽出
+
+    Args:
+        file_path: Excelファイルのパス
+        sheet_name: シート名
+
+    Returns:
+        (シート名, ExcelSheetData) のタプル
+    """
+    import pandas as pd
+
+    df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl')
+    return sheet_name, _extract_dataframe_text(df)
+
+
 def _extract_dataframe_text(df) -> ExcelSheetData:
     """
     pandas DataFrameからテキスト情報を抽出
@@ -111,48 +209,35 @@ def _extract_dataframe_text(df) -> ExcelSheetData:
     Returns:
         抽出されたテキスト情報のPydanticモデル
     """
-    import pandas as pd
-    
-    # NaN値を空文字列に変換
-    df = df.fillna("")
-    
-    # 全セルのテキストを抽出
+    import numpy as np
+
+    # 全セルを一括で文字列化（NaNは空文字列）し、numpyのC実装で空セル判定
+    arr = df.fillna("").astype(str).to_numpy(dtype=str)
+    columns = np.asarray(df.columns, dtype=object)
+    mask = np.char.strip(arr) != ""
+
+    # 行データと全テキストを構築（Pythonループは空でない行のみ）
     all_texts = []
-    rows_data = []
-    
-    for index, row in df.iterrows():
-        row_texts = []
-        row_data = {}
-        
-        for col in df.columns:
-            cell_value = str(row[col]) if pd.notna(row[col]) else ""
-            if cell_value.strip():  # 空でない場合のみ追加
-                row_texts.append(cell_value)
-                row_data[col] = cell_value
-        
-        if row_texts:  # 空行でない場合のみ追加
-            all_texts.extend(row_texts)
-            rows_data.append({
-                "row_index": int(index),
-                "data": row_data,
-                "text": " ".join(row_texts)
-            })
-    
+    rows_models = []
+
+    for i, index in enumerate(df.index):
+        row_mask = mask[i]
+        if not row_mask.any():  # 空行はスキップ
+            continue
+
+        row_values = [str(v) for v in arr[i, row_mask]]
+        all_texts.extend(row_values)
+        rows_models.append(ExcelRowData(
+            row_index=int(index),
+            data=dict(zip(columns[row_mask], row_values)),
+            text=" ".join(row_values)
+        ))
+
     # 全テキストを結合
     full_text = " ".join(all_texts)
-    
-    # 行データをPydanticモデルに変換
-    rows_models = [
-        ExcelRowData(
-            row_index=row["row_index"],
-            data=row["data"],
-            text=row["text"]
-        )
-        for row in rows_data
-    ]
-    
+
     return ExcelSheetData(
-        row_count=len(rows_data),
+        row_count=len(rows_models),
         column_count=len(df.columns),
         columns=list(df.columns),
         rows=rows_models,
@@ -184,10 +269,10 @@ def read_excel_simple(file_path: str, sheet_name: Optional[str] = None) -> str:
     
     try:
         if sheet_name:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl')
+            df = pd.read_excel(_cached_excel_file(file_path), sheet_name=sheet_name)
             return _dataframe_to_text(df)
         else:
-            excel_file = pd.ExcelFile(file_path, engine='openpyxl')
+            excel_file = _cached_excel_file(file_path)
             texts = []
             for sheet in excel_file.sheet_names:
                 df = pd.read_excel(excel_file, sheet_name=sheet)
@@ -208,68 +293,159 @@ def _dataframe_to_text(df) -> str:
     Returns:
         テキスト文字列
     """
-    df = df.fillna("")
-    lines = []
-    
-    for index, row in df.iterrows():
-        row_values = [str(val) for val in row.values if str(val).strip()]
-        if row_values:
-            lines.append(" | ".join(row_values))
-    
+    import numpy as np
+
+    # 全セルを一括で文字列化し、空セル判定はnumpyのC実装で行う
+    arr = df.fillna("").astype(str).to_numpy(dtype=str)
+    mask = np.char.strip(arr) != ""
+
+    lines = [
+        " | ".join(arr[i, mask[i]])
+        for i in range(arr.shape[0])
+        if mask[i].any()
+    ]
+
     return "\n".join(lines)
 
 
+def _column_ref_to_index(column_ref: str) -> int:
+    """
+    セル参照の列文字（"A", "Z", "AB"など）を1始まりの列番号に変換
+
+    Args:
+        column_ref: 列文字
+
+    Returns:
+        列番号（1始まり）
+    """
+    index = 0
+    for char in column_ref:
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index
+
+
+def _read_sheet_dimension(zipf, member: str) -> Optional[tuple]:
+    """
+    ワークシートXMLの<dimension>タグから行数・列数を取得
+
+    セルを走査せず、XMLストリームの先頭付近にある<dimension>だけを
+    読んで打ち切るため、シートの大きさによらず一定コストで済む。
+
+    Args:
+        zipf: 開いているzipfile.ZipFile
+        member: ワークシートXMLのアーカイブ内パス
+
+    Returns:
+        (max_row, max_column) のタプル。<dimension>がない場合はNone
+    """
+    try:
+        # lxml（libxml2のC実装）の方がXMLスループットが数倍高い
+        from lxml.etree import iterparse
+    except ImportError:
+        from xml.etree.ElementTree import iterparse
+
+    with zipf.open(member) as f:
+        for _, element in iterparse(f, events=("start",)):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "dimension":
+                ref = element.get("ref", "")
+                match = _CELL_REF_RE.match(ref.rsplit(":", 1)[-1])
+                if match:
+                    return int(match.group(2)), _column_ref_to_index(match.group(1))
+                return None
+            if tag == "sheetData":
+                # dimensionはsheetDataより前に現れる。ここまで来たら存在しない
+                return None
+    return None
+
+
+def _sheet_dimension_fallback(file_path: str, sheet_name: str) -> tuple:
+    """
+    <dimension>タグがないシート用のフォールバック（openpyxlで走査）
+
+    Args:
+        file_path: Excelファイルのパス
+        sheet_name: シート名
+
+    Returns:
+        (max_row, max_column) のタプル
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = wb[sheet_name]
+        return sheet.max_row, sheet.max_column
+    finally:
+        wb.close()
+
+
 def get_excel_metadata(file_path: str) -> Dict[str, Any]:
     """
-    Excelファイルのメタ情報を取得（ファイルを開かずに）
-    
+    Excelファイルのメタ情報を取得（セルデータを読み込まずに）
+
     Args:
         file_path: Excelファイルのパス
-        
+
     Returns:
         メタ情報の辞書
     """
-    try:
-        import openpyxl
-    except ImportError:
-        raise ImportError("openpyxlが必要です。'pip install openpyxl'でインストールしてください。")
-    
+    import zipfile
+    import xml.etree.ElementTree as ET
+
     path = Path(file_path)
-    
+
     if not path.exists():
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
-    
+
     try:
-        # ファイルを開いてメタ情報のみ取得
-        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-        
-        sheet_info = []
-        total_rows = 0
-        total_cols = 0
-        
-        for sheet_name in wb.sheetnames:
-            sheet = wb[sheet_name]
-            max_row = sheet.max_row
-            max_col = sheet.max_column
-            
-            sheet_info.append({
-                "name": sheet_name,
-                "max_row": max_row,
-                "max_column": max_col,
-                "active": sheet_name == wb.active.title
-            })
-            
-            total_rows += max_row
-            total_cols = max(total_cols, max_col)
-        
-        wb.close()
-        
+        with zipfile.ZipFile(file_path) as z:
+            workbook = ET.fromstring(z.read("xl/workbook.xml"))
+
+            # r:id -> ワークシートXMLパスの対応表
+            rels = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+            targets = {}
+            for rel in rels.findall(f"{{{_NS_RELS}}}Relationship"):
+                target = rel.get("Target", "")
+                targets[rel.get("Id")] = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+            # アクティブシートのインデックス
+            active_index = 0
+            view = workbook.find(f"{{{_NS_MAIN}}}bookViews/{{{_NS_MAIN}}}workbookView")
+            if view is not None:
+                active_index = int(view.get("activeTab", 0))
+
+            sheet_names = []
+            sheet_info = []
+            total_rows = 0
+            total_cols = 0
+
+            for idx, sheet_el in enumerate(workbook.findall(f"{{{_NS_MAIN}}}sheets/{{{_NS_MAIN}}}sheet")):
+                name = sheet_el.get("name")
+                sheet_names.append(name)
+
+                member = targets.get(sheet_el.get(f"{{{_NS_REL_ATTR}}}id"))
+                dimension = _read_sheet_dimension(z, member) if member else None
+                if dimension is None:
+                    dimension = _sheet_dimension_fallback(file_path, name)
+                max_row, max_col = dimension
+
+                sheet_info.append({
+                    "name": name,
+                    "max_row": max_row,
+                    "max_column": max_col,
+                    "active": idx == active_index
+                })
+
+                total_rows += max_row
+                total_cols = max(total_cols, max_col)
+
         return {
             "file_path": str(path.absolute()),
             "filename": path.name,
-            "sheet_count": len(wb.sheetnames),
-            "sheet_names": wb.sheetnames,
-            "active_sheet": wb.active.title if wb.active else None,
+            "sheet_count": len(sheet_names),
+            "sheet_names": sheet_names,
+            "active_sheet": sheet_names[active_index] if active_index < len(sheet_names) else None,
             "sheets": sheet_info,
             "total_rows": total_rows,
             "max_columns": total_cols
@@ -290,57 +466,66 @@ def extract_excel_to_chunks(file_path: str, chunk_size: int = 1000) -> List[Dict
         チャンクのリスト
     """
     try:
-        import pandas as pd
+        import openpyxl
     except ImportError:
-        raise ImportError("pandasが必要です。'pip install pandas openpyxl'でインストールしてください。")
-    
+        raise ImportError("openpyxlが必要です。'pip install openpyxl'でインストールしてください。")
+
     path = Path(file_path)
-    
+
     if not path.exists():
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
-    
-    excel_file = pd.ExcelFile(file_path, engine='openpyxl')
+
+    # read_only=Trueでストリーミング読み込み（DataFrameを構築せず1行ずつ処理）
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
     chunks = []
     chunk_id = 0
-    
-    for sheet_name in excel_file.sheet_names:
-        df = pd.read_excel(excel_file, sheet_name=sheet_name)
-        df = df.fillna("")
-        
-        current_chunk = ""
-        current_chunk_rows = []
-        
-        for index, row in df.iterrows():
-            row_text = " ".join([str(val) for val in row.values if str(val).strip()])
-            
-            if len(current_chunk) + len(row_text) > chunk_size and current_chunk:
-                # チャンクを保存
-                chunks.append({
-                    "chunk_id": chunk_id,
-                    "sheet_name": sheet_name,
-                    "row_start": current_chunk_rows[0] if current_chunk_rows else index,
-                    "row_end": current_chunk_rows[-1] if current_chunk_rows else index,
-                    "text": current_chunk.strip(),
-                    "char_count": len(current_chunk)
-                })
-                chunk_id += 1
-                current_chunk = ""
-                current_chunk_rows = []
-            
-            current_chunk += row_text + " "
-            current_chunk_rows.append(int(index))
-        
-        # 最後のチャンクを保存
-        if current_chunk.strip():
-            chunks.append({
-                "chunk_id": chunk_id,
-                "sheet_name": sheet_name,
-                "row_start": current_chunk_rows[0] if current_chunk_rows else 0,
-                "row_end": current_chunk_rows[-1] if current_chunk_rows else 0,
-                "text": current_chunk.strip(),
-                "char_count": len(current_chunk)
-            })
-            chunk_id += 1
-    
+
+    try:
+        for sheet in wb.worksheets:
+            sheet_name = sheet.title
+            # 文字列の+=はO(n^2)になるため、リストに貯めてフラッシュ時にjoinする
+            current_parts = []
+            current_len = 0
+            current_chunk_rows = []
+
+            for row_index, row in enumerate(sheet.iter_rows(values_only=True)):
+                row_text = " ".join([str(val) for val in row if val is not None and str(val).strip()])
+
+                if current_len + len(row_text) > chunk_size and current_parts:
+                    # チャンクを保存
+                    current_chunk = " ".join(current_parts) + " "
+                    chunks.append({
+                        "chunk_id": chunk_id,
+                        "sheet_name": sheet_name,
+                        "row_start": current_chunk_rows[0],
+                        "row_end": current_chunk_rows[-1],
+                        "text": current_chunk.strip(),
+                        "char_count": len(current_chunk)
+                    })
+                    chunk_id += 1
+                    current_parts = []
+                    current_len = 0
+                    current_chunk_rows = []
+
+                current_parts.append(row_text)
+                current_len += len(row_text) + 1
+                current_chunk_rows.append(row_index)
+
+            # 最後のチャンクを保存
+            if current_parts:
+                current_chunk = " ".join(current_parts) + " "
+                if current_chunk.strip():
+                    chunks.append({
+                        "chunk_id": chunk_id,
+                        "sheet_name": sheet_name,
+                        "row_start": current_chunk_rows[0],
+                        "row_end": current_chunk_rows[-1],
+                        "text": current_chunk.strip(),
+                        "char_count": len(current_chunk)
+                    })
+                    chunk_id += 1
+    finally:
+        wb.close()
+
     return chunks
 
@@ -1,12 +1,14 @@
 """ファイル読み込みとメタ情報取得モジュール"""
+import functools
 import os
+import stat as stat_module
 import hashlib
 import mimetypes
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional, Any, List
 import json
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class FileMetadata(BaseModel):
@@ -16,7 +18,7 @@ class FileMetadata(BaseModel):
     file_path: str = Field(..., description="ファイルの絶対パス")
     file_type: str = Field(..., description="ファイル拡張子")
     file_size: int = Field(..., ge=0, description="ファイルサイズ（バイト）")
-    file_hash: str = Field(..., description="ファイルのハッシュ値")
+    file_hash: str = Field(default="", description="ファイルのハッシュ値（未計算の場合は空文字列）")
     mime_type: str = Field(..., description="MIMEタイプ")
     created_at: str = Field(..., description="作成日時（ISO形式）")
     file_last_modified: str = Field(..., description="最終更新日時（ISO形式）")
@@ -27,8 +29,8 @@ class FileMetadata(BaseModel):
     category: str = Field(default="general", description="ファイルのカテゴリ")
     active: bool = Field(default=True, description="ファイルがアクティブかどうか")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "file_id": "/path/to/file.txt",
                 "filename": "file.txt",
@@ -47,53 +49,86 @@ class FileMetadata(BaseModel):
                 "active": True
             }
         }
+    )
 
 
-def get_file_metadata(file_path: str) -> FileMetadata:
+@functools.lru_cache(maxsize=1024)
+def _iso_from_timestamp(ts: float) -> str:
+    """
+    エポック秒をISO形式の文字列に変換（結果をキャッシュ）
+
+    timespec="seconds"でマイクロ秒の整形を省き、同じファイルを
+    繰り返しスキャンする場合はdatetime生成自体をスキップする。
+
+    Args:
+        ts: エポック秒
+
+    Returns:
+        ISO形式の日時文字列（秒精度）
+    """
+    return datetime.fromtimestamp(ts).isoformat(timespec="seconds")
+
+
+@functools.lru_cache(maxsize=512)
+def _mime_for_ext(ext: str) -> str:
+    """
+    拡張子からMIMEタイプを取得（結果をキャッシュ）
+
+    Args:
+        ext: 小文字の拡張子（例: ".txt"）
+
+    Returns:
+        MIMEタイプ（不明な場合は "application/octet-stream"）
+    """
+    return mimetypes.types_map.get(ext) or mimetypes.guess_type(f"x{ext}")[0] or "application/octet-stream"
+
+
+def get_file_metadata(file_path: str, compute_hash: bool = False) -> FileMetadata:
     """
     ファイルのメタ情報を取得
-    
+
     Args:
         file_path: ファイルパス
-        
+        compute_hash: ファイルハッシュも計算するか（全量読み込みが発生するためデフォルトは無効）
+
     Returns:
         メタ情報のPydanticモデル
-        
+
     Raises:
         FileNotFoundError: ファイルが存在しない場合
         OSError: ファイルアクセスエラー
     """
-    path = Path(file_path)
-    
-    if not path.exists():
+    # statは1回だけ発行し、存在確認・種別判定・メタ情報のすべてに使い回す
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
-    
-    if not path.is_file():
+
+    if not stat_module.S_ISREG(st.st_mode):
         raise ValueError(f"ファイルではありません: {file_path}")
-    
-    # 基本情報
-    stat = path.stat()
-    
-    # ファイルハッシュ（MD5）
-    file_hash = calculate_file_hash(file_path)
-    
-    # MIMEタイプ
-    mime_type, _ = mimetypes.guess_type(file_path)
-    
-    # 拡張子
-    file_ext = path.suffix.lower()
-    
+
+    # 絶対パス・ファイル名・拡張子は文字列操作のみで取得（Pathの多重生成を回避）
+    abs_path = os.path.abspath(file_path)
+    filename = os.path.basename(abs_path)
+    file_ext = os.path.splitext(filename)[1].lower()
+
+    # ファイルハッシュ（MD5）: 要求された場合のみ計算
+    file_hash = calculate_file_hash(file_path) if compute_hash else ""
+
+    # MIMEタイプ（拡張子ごとの結果をキャッシュ）
+    mime_type = _mime_for_ext(file_ext)
+
     # メタ情報を構築してPydanticモデルとして返す
     return FileMetadata(
-        file_id=str(path.absolute()),  # 一意なIDとして絶対パスを使用（実際はUUID推奨）
-        filename=path.name,
-        file_path=str(path.absolute()),
+        file_id=abs_path,  # 一意なIDとして絶対パスを使用（実際はUUID推奨）
+        filename=filename,
+        file_path=abs_path,
         file_type=file_ext,
-        file_size=stat.st_size,
+        file_size=st.st_size,
         file_hash=file_hash,
         mime_type=mime_type or "application/octet-stream",
-        created_at=datetime.fromtimestamp(stat.st_ctime).isoformat(),
-        file_last_modified=datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        created_at=_iso_from_timestamp(st.st_ctime),
+        file_last_modified=_iso_from_timestamp(st.st_mtime),
         file_owner=get_file_owner(file_path),
         file_revision="",  # バージョン管理システムから取得する場合は実装
         file_tags=[],  # タグは別途管理
@@ -103,48 +138,114 @@ def get_file_metadata(file_path: str) -> FileMetadata:
     )
 
 
+def ensure_file_hash(metadata: FileMetadata, algorithm: str = "md5") -> FileMetadata:
+    """
+    メタ情報のファイルハッシュを必要になった時点で計算して埋める
+
+    Args:
+        metadata: get_file_metadata(compute_hash=False)で取得したメタ情報
+        algorithm: ハッシュアルゴリズム
+
+    Returns:
+        file_hashが設定されたメタ情報（同じインスタンス）
+    """
+    if not metadata.file_hash:
+        metadata.file_hash = calculate_file_hash(metadata.file_path, algorithm)
+    return metadata
+
+
+# ハッシュキャッシュ: (絶対パス, mtime_ns, サイズ, アルゴリズム) -> ハッシュ値
+_hash_cache: Dict[tuple, str] = {}
+
+
 def calculate_file_hash(file_path: str, algorithm: str = "md5") -> str:
     """
     ファイルのハッシュ値を計算
-    
+
     Args:
         file_path: ファイルパス
-        algorithm: ハッシュアルゴリズム（md5, sha1, sha256）
-        
+        algorithm: ハッシュアルゴリズム（md5, sha1, sha256, blake3）
+
     Returns:
         ハッシュ値（16進数文字列）
     """
-    hash_obj = hashlib.new(algorithm)
-    
+    # パス・更新時刻・サイズが一致すれば再計算せずキャッシュから返す
+    stat = os.stat(file_path)
+    cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, algorithm)
+    cached = _hash_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    file_hash = _compute_file_hash(file_path, algorithm)
+    _hash_cache[cache_key] = file_hash
+    return file_hash
+
+
+def _compute_file_hash(file_path: str, algorithm: str) -> str:
+    """
+    ファイルのハッシュ値を実際に計算（キャッシュを経由しない）
+
+    Args:
+        file_path: ファイルパス
+        algorithm: ハッシュアルゴリズム
+
+    Returns:
+        ハッシュ値（16進数文字列）
+    """
+    if algorithm == "blake3":
+        # blake3はSIMD＋マルチスレッドでメモリ帯域を使い切れる
+        try:
+            from blake3 import blake3
+        except ImportError:
+            raise ImportError("blake3が必要です。'pip install blake3'でインストールしてください。")
+
+        hasher = blake3(max_threads=blake3.AUTO)
+        hasher.update_mmap(file_path)
+        return hasher.hexdigest()
+
     with open(file_path, 'rb') as f:
-        # 大きなファイルでもメモリ効率的に処理
-        for chunk in iter(lambda: f.read(4096), b""):
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: C実装内でファイル全体をハッシュ（GILも解放される）
+            return hashlib.file_digest(f, algorithm).hexdigest()
+
+        # フォールバック: 1MiB単位で読み込んで計算
+        hash_obj = hashlib.new(algorithm)
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
             hash_obj.update(chunk)
-    
-    return hash_obj.hexdigest()
+        return hash_obj.hexdigest()
+
+
+# SID文字列 -> アカウント名のキャッシュ
+# LookupAccountSidはドメイン環境でRPCになり得るため、同じ所有者の再解決を避ける
+_sid_name_cache: Dict[str, str] = {}
 
 
 def get_file_owner(file_path: str) -> str:
     """
     ファイルの所有者を取得（Windows対応）
-    
+
     Args:
         file_path: ファイルパス
-        
+
     Returns:
         所有者名（取得できない場合は空文字列）
     """
     try:
         import win32security
-        import win32api
-        
+
         # ファイルのセキュリティ情報を取得
         sd = win32security.GetFileSecurity(
             file_path,
             win32security.OWNER_SECURITY_INFORMATION
         )
         owner_sid = sd.GetSecurityDescriptorOwner()
-        owner_name, _, _ = win32security.LookupAccountSid(None, owner_sid)
+
+        # SID -> 名前の解決はキャッシュ（ツリー内のファイルは大半が同じ所有者）
+        sid_key = win32security.ConvertSidToStringSid(owner_sid)
+        owner_name = _sid_name_cache.get(sid_key)
+        if owner_name is None:
+            owner_name, _, _ = win32security.LookupAccountSid(None, owner_sid)
+            _sid_name_cache[sid_key] = owner_name
         return owner_name
     except ImportError:
         # win32securityが利用できない場合は、環境変数から取得
@@ -215,24 +316,25 @@ def get_file_info_summary(file_path: str) -> Dict[str, Any]:
         ファイル情報のサマリー
     """
     try:
-        path = Path(file_path)
-        
-        if not path.exists():
+        # statを1回だけ発行し、存在確認と種別判定を兼ねる
+        try:
+            st = os.stat(file_path)
+        except (FileNotFoundError, NotADirectoryError):
             return {
                 "exists": False,
                 "error": "ファイルが見つかりません"
             }
-        
-        stat = path.stat()
-        
+
+        filename = os.path.basename(os.path.abspath(file_path))
+
         return {
             "exists": True,
-            "filename": path.name,
-            "file_size": stat.st_size,
-            "file_type": path.suffix.lower(),
-            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-            "is_file": path.is_file(),
-            "is_directory": path.is_dir()
+            "filename": filename,
+            "file_size": st.st_size,
+            "file_type": os.path.splitext(filename)[1].lower(),
+            "modified": _iso_from_timestamp(st.st_mtime),
+            "is_file": stat_module.S_ISREG(st.st_mode),
+            "is_directory": stat_module.S_ISDIR(st.st_mode)
         }
     except Exception as e:
         return {
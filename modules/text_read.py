@@ -1,11 +1,55 @@
 """テキストファイル読み込みモジュール"""
+import asyncio
+import codecs
+import functools
+import itertools
+import mmap
 import os
-import json
-import yaml
+import re
+import stat as stat_module
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# 単語カウント用の正規表現（split()と同じく空白区切りのトークンを数える）
+_WORD_RE = re.compile(r"\S+")
+
+# これを超えるサイズのファイルはmmapで読み込む（バイト）
+_MMAP_MIN_FILE_SIZE = 1 << 20
+
+# 改行(0x0A)がマルチバイト文字の一部として現れないエンコーディング
+_ASCII_COMPATIBLE_ENCODINGS = frozenset({
+    'utf-8', 'utf-8-sig', 'ascii', 'cp932', 'shift_jis', 'latin-1',
+    'iso8859-1'  # latin-1のcodecs正規名
+})
+
+
+def _count_newlines_bytes(buf) -> int:
+    """
+    バイト列（またはmmap）中の改行数をカウント
+
+    numpyが利用できる場合はベクトル化された比較で一括カウントし、
+    なければfind（memchrベース）を繰り返すフォールバックを使う。
+
+    Args:
+        buf: バイト列またはmmapオブジェクト
+
+    Returns:
+        改行の個数
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        count = 0
+        pos = buf.find(b"\n")
+        while pos != -1:
+            count += 1
+            pos = buf.find(b"\n", pos + 1)
+        return count
+
+    return int((np.frombuffer(buf, dtype=np.uint8) == 0x0A).sum())
 
 
 class TextFileData(BaseModel):
@@ -21,8 +65,8 @@ class TextFileData(BaseModel):
     is_binary: bool = Field(..., description="バイナリファイルかどうか")
     extracted_at: str = Field(..., description="抽出日時（ISO形式）")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "file_path": "/path/to/file.txt",
                 "filename": "file.txt",
@@ -36,6 +80,7 @@ class TextFileData(BaseModel):
                 "extracted_at": "2024-01-01T00:00:00"
             }
         }
+    )
 
 
 class TextChunkData(BaseModel):
@@ -47,36 +92,136 @@ class TextChunkData(BaseModel):
     char_count: int = Field(..., ge=0, description="文字数")
 
 
+class TextChunkBatch(BaseModel):
+    """
+    チャンク列のSoA（Structure of Arrays）表現のPydanticモデル
+
+    チャンクごとにモデルインスタンスを持たず、整数フィールドを
+    numpy配列として列単位で保持する。チャンク数が多い場合の
+    オブジェクトヘッダとフィールド参照のオーバーヘッドを省き、
+    数値列をそのまま配列演算やDB書き込みに渡せる。
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    chunk_ids: Any = Field(..., description="チャンクIDのnumpy配列（int64）")
+    line_starts: Any = Field(..., description="開始行番号のnumpy配列（int64）")
+    line_ends: Any = Field(..., description="終了行番号のnumpy配列（int64）")
+    char_counts: Any = Field(..., description="文字数のnumpy配列（int64）")
+    texts: List[str] = Field(..., description="チャンクテキストのリスト")
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, index: int) -> TextChunkData:
+        """指定インデックスのチャンクをTextChunkDataとして実体化"""
+        return TextChunkData.model_construct(
+            chunk_id=int(self.chunk_ids[index]),
+            line_start=int(self.line_starts[index]),
+            line_end=int(self.line_ends[index]),
+            text=self.texts[index],
+            char_count=int(self.char_counts[index])
+        )
+
+
+# エンコーディング検出結果のキャッシュ: (絶対パス, mtime_ns, サイズ) -> エンコーディング
+_encoding_cache: Dict[tuple, str] = {}
+
+# BOMとエンコーディングの対応
+_BOM_ENCODINGS = (
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe', 'utf-16-le'),
+    (b'\xfe\xff', 'utf-16-be'),
+)
+
+
 def detect_encoding(file_path: str) -> str:
     """
     ファイルのエンコーディングを検出
-    
+
+    BOMとASCIIの高速パスで大半のファイルを即決し、本当に判定が必要な
+    場合のみ検出ライブラリにフォールバックする。結果は
+    (パス, mtime, サイズ)をキーにキャッシュされる。
+
     Args:
         file_path: ファイルパス
-        
+
     Returns:
         検出されたエンコーディング（デフォルト: utf-8）
     """
     try:
-        import chardet
-    except ImportError:
-        # chardetが利用できない場合は、UTF-8とCP932を試す
-        return _try_encodings(file_path)
-    
+        st = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+    except OSError:
+        cache_key = None
+
+    if cache_key is not None:
+        cached = _encoding_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    encoding = _detect_encoding_uncached(file_path)
+    if cache_key is not None:
+        _encoding_cache[cache_key] = encoding
+    return encoding
+
+
+def _detect_encoding_uncached(file_path: str) -> str:
+    """
+    キャッシュを経由せずにエンコーディングを検出
+
+    Args:
+        file_path: ファイルパス
+
+    Returns:
+        検出されたエンコーディング
+    """
     try:
-        with open(file_path, 'rb') as f:
-            raw_data = f.read(10000)  # 最初の10KBを読み込んで検出
-            result = chardet.detect(raw_data)
-            encoding = result.get('encoding', 'utf-8')
-            
-            # 信頼度が低い場合は、UTF-8とCP932を試す
-            if result.get('confidence', 0) < 0.7:
-                return _try_encodings(file_path)
-            
-            return encoding.lower()
-    except Exception:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            raw_data = os.read(fd, 4096)
+        finally:
+            os.close(fd)
+    except OSError:
         return _try_encodings(file_path)
 
+    # BOMがあれば即決
+    for bom, encoding in _BOM_ENCODINGS:
+        if raw_data.startswith(bom):
+            return encoding
+
+    # ASCIIのみならUTF-8のサブセットなので即決（実ファイルの大半がここで決まる）
+    try:
+        raw_data.decode('ascii')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    # 本格的な判定が必要な場合のみ検出ライブラリにかける
+    # （ライブラリはutf_8のようなアンダースコア形式を返すことがあるため、
+    # codecs.lookupでモジュール内で使うダッシュ形式の正規名に揃える）
+    try:
+        from charset_normalizer import from_bytes
+        best = from_bytes(raw_data).best()
+        if best is not None and best.encoding:
+            return codecs.lookup(best.encoding).name
+    except ImportError:
+        pass
+
+    try:
+        import chardet
+        result = chardet.detect(raw_data)
+        encoding = result.get('encoding')
+        # 信頼度が低い場合は、UTF-8とCP932を試す
+        if encoding and result.get('confidence', 0) >= 0.7:
+            try:
+                return codecs.lookup(encoding).name
+            except LookupError:
+                return encoding.lower()
+    except ImportError:
+        pass
+
+    return _try_encodings(file_path)
+
 
 def _try_encodings(file_path: str) -> str:
     """
@@ -102,89 +247,161 @@ def _try_encodings(file_path: str) -> str:
     return 'utf-8'
 
 
+# テキストファイルの拡張子リスト（呼び出しごとのset構築を避けるためモジュールレベル）
+_TEXT_EXTENSIONS = frozenset({
+    '.txt', '.md', '.markdown', '.rst', '.log',
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.h', '.hpp',
+    '.cs', '.go', '.rs', '.rb', '.php', '.swift', '.kt', '.scala',
+    '.html', '.htm', '.xml', '.css', '.scss', '.sass', '.less',
+    '.sh', '.bash', '.zsh', '.fish', '.ps1', '.bat', '.cmd',
+    '.sql', '.r', '.m', '.pl', '.pm', '.lua', '.vim', '.vimrc',
+    '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf', '.config',
+    '.json', '.jsonl', '.csv', '.tsv',
+    '.dockerfile', '.gitignore', '.gitattributes', '.env',
+    '.makefile', '.cmake', '.gradle', '.properties',
+    '.tex', '.bib', '.sty', '.cls'
+})
+
+
 def is_text_file(file_path: str) -> bool:
     """
     ファイルがテキストファイルかどうかを判定
-    
+
     Args:
         file_path: ファイルパス
-        
+
     Returns:
         テキストファイルかどうか
     """
-    path = Path(file_path)
-    ext = path.suffix.lower()
-    
-    # テキストファイルの拡張子リスト
-    text_extensions = {
-        '.txt', '.md', '.markdown', '.rst', '.log',
-        '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.h', '.hpp',
-        '.cs', '.go', '.rs', '.rb', '.php', '.swift', '.kt', '.scala',
-        '.html', '.htm', '.xml', '.css', '.scss', '.sass', '.less',
-        '.sh', '.bash', '.zsh', '.fish', '.ps1', '.bat', '.cmd',
-        '.sql', '.r', '.m', '.pl', '.pm', '.lua', '.vim', '.vimrc',
-        '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf', '.config',
-        '.json', '.jsonl', '.csv', '.tsv',
-        '.dockerfile', '.gitignore', '.gitattributes', '.env',
-        '.makefile', '.cmake', '.gradle', '.properties',
-        '.tex', '.bib', '.sty', '.cls'
-    }
-    
-    return ext in text_extensions
+    # Path生成を避け、文字列操作だけで拡張子を取り出す
+    return os.path.splitext(file_path)[1].lower() in _TEXT_EXTENSIONS
 
 
-def read_text_file(file_path: str, encoding: Optional[str] = None) -> TextFileData:
+def _read_raw(file_path: str, encoding: Optional[str] = None) -> tuple:
     """
-    テキストファイルを読み込む
-    
+    ファイル内容とエンコーディングだけを取得する軽量読み込み
+
+    統計計算やPydanticモデル構築を行わないため、contentだけが必要な
+    呼び出し元（simple/lines/チャンク抽出）はこちらを使う。
+
     Args:
         file_path: テキストファイルのパス
         encoding: エンコーディング（Noneの場合は自動検出）
-        
+
     Returns:
-        テキストファイルデータのPydanticモデル
-        
+        (ファイル内容, 使用したエンコーディング, 改行数またはNone) のタプル。
+        改行数は大きなファイルのmmapパスでのみ事前カウントされる
+
     Raises:
         FileNotFoundError: ファイルが存在しない場合
         ValueError: テキストファイルとして読み込めない場合
     """
-    path = Path(file_path)
-    
-    if not path.exists():
+    # statは1回だけ発行し、存在確認・種別判定・サイズ取得を兼ねる
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
-    
-    if not path.is_file():
+
+    if not stat_module.S_ISREG(st.st_mode):
         raise ValueError(f"ファイルではありません: {file_path}")
-    
+
     # エンコーディングを検出
     if encoding is None:
         detected_encoding = detect_encoding(file_path)
     else:
         detected_encoding = encoding
-    
-    # バイナリファイルかどうかを判定
-    is_binary = not is_text_file(file_path)
-    
+
     # ファイルを読み込む
     try:
-        with open(path, 'r', encoding=detected_encoding) as f:
-            content = f.read()
+        content, newline_count = _read_decoded(file_path, detected_encoding, st.st_size)
     except UnicodeDecodeError:
         # 指定されたエンコーディングで読み込めない場合は、再検出を試みる
         if encoding is not None:
             detected_encoding = detect_encoding(file_path)
-            with open(path, 'r', encoding=detected_encoding) as f:
-                content = f.read()
+            content, newline_count = _read_decoded(file_path, detected_encoding, st.st_size)
         else:
             raise ValueError(f"ファイルをテキストとして読み込めません: {file_path}")
-    
-    # 統計情報を計算
-    lines = content.splitlines()
-    line_count = len(lines)
+
+    return content, detected_encoding, newline_count
+
+
+def _read_decoded(path: str, encoding: str, size: int) -> tuple:
+    """
+    ファイルを指定エンコーディングでデコードして読み込む
+
+    一定サイズを超えるファイルはmmapで読み込み、memoryview経由で
+    直接デコードすることでread()の中間バッファ（ファイルサイズ分の
+    コピー）を省く。ASCII互換エンコーディングの場合は、デコード前の
+    バイト列上で改行数もベクトル化カウントして返す。
+
+    Args:
+        path: ファイルパス
+        encoding: エンコーディング
+        size: ファイルサイズ（呼び出し側のstat結果を使い回す）
+
+    Returns:
+        (ファイルの内容, 改行数またはNone) のタプル
+
+    Raises:
+        UnicodeDecodeError: デコードできない場合
+    """
+    if size > _MMAP_MIN_FILE_SIZE:
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                newline_count = None
+                if encoding.lower() in _ASCII_COMPATIBLE_ENCODINGS:
+                    newline_count = _count_newlines_bytes(mm)
+                content = str(memoryview(mm), encoding)
+        # テキストモードのopenと同じユニバーサル改行変換を適用し、
+        # ファイルサイズによって読み込み結果が変わらないようにする
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+            # 変換で改行数が変わるため、事前カウントは破棄して再計算させる
+            newline_count = None
+        return content, newline_count
+
+    with open(path, 'r', encoding=encoding) as f:
+        return f.read(), None
+
+
+def read_text_file(
+    file_path: str,
+    encoding: Optional[str] = None,
+    extracted_at: Optional[str] = None
+) -> TextFileData:
+    """
+    テキストファイルを読み込む
+
+    Args:
+        file_path: テキストファイルのパス
+        encoding: エンコーディング（Noneの場合は自動検出）
+        extracted_at: 抽出日時（ISO形式）。一括取り込みでは呼び出し側で
+            1回だけ生成して渡すことでdatetime.now()の繰り返しを省ける
+
+    Returns:
+        テキストファイルデータのPydanticモデル
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+        ValueError: テキストファイルとして読み込めない場合
+    """
+    path = Path(file_path)
+
+    content, detected_encoding, newline_count = _read_raw(file_path, encoding)
+
+    # バイナリファイルかどうかを判定
+    is_binary = not is_text_file(file_path)
+
+    # 統計情報を計算（行・単語のリストを実体化せずにカウントのみ行う）
+    if newline_count is None:
+        newline_count = content.count("\n")
+    line_count = newline_count + (0 if not content or content.endswith("\n") else 1)
     char_count = len(content)
-    word_count = len(content.split()) if content else 0
+    word_count = sum(1 for _ in _WORD_RE.finditer(content)) if content else 0
     
-    return TextFileData(
+    # すべて内部で計算した値のため、バリデーションを省いて構築する
+    # （content（数十MBになり得る）のstr検証を1回スキップできる）
+    return TextFileData.model_construct(
         file_path=str(path.absolute()),
         filename=path.name,
         file_type=path.suffix.lower(),
@@ -194,10 +411,84 @@ def read_text_file(file_path: str, encoding: Optional[str] = None) -> TextFileDa
         char_count=char_count,
         word_count=word_count,
         is_binary=is_binary,
-        extracted_at=datetime.now().isoformat()
+        extracted_at=extracted_at if extracted_at is not None else datetime.now().isoformat()
     )
 
 
+async def read_text_file_async(file_path: str, encoding: Optional[str] = None) -> TextFileData:
+    """
+    read_text_fileをワーカースレッドで実行する非同期版
+
+    ブロッキングI/Oをイベントループの外に逃がすため、FastAPIの
+    エンドポイントなどasyncコンテキストからはこちらを使う。
+
+    Args:
+        file_path: テキストファイルのパス
+        encoding: エンコーディング（Noneの場合は自動検出）
+
+    Returns:
+        テキストファイルデータのPydanticモデル
+    """
+    return await asyncio.to_thread(read_text_file, file_path, encoding)
+
+
+async def read_text_files_async(
+    file_paths: List[str],
+    encoding: Optional[str] = None
+) -> List[TextFileData]:
+    """
+    複数のテキストファイルを並行して読み込む
+
+    各ファイルの読み込みをスレッドプールに投げてgatherするため、
+    ファイルが独立していればsyscallのレイテンシが重なり合う。
+
+    Args:
+        file_paths: テキストファイルのパスのリスト
+        encoding: エンコーディング（Noneの場合は自動検出）
+
+    Returns:
+        テキストファイルデータのリスト（file_pathsと同じ順序）
+    """
+    # 抽出日時はバッチごとに1回だけ生成して全ファイルで共有する
+    batch_ts = datetime.now().isoformat()
+    return list(await asyncio.gather(
+        *(asyncio.to_thread(read_text_file, file_path, encoding, batch_ts)
+          for file_path in file_paths)
+    ))
+
+
+def read_many_text(
+    file_paths: List[str],
+    workers: Optional[int] = None,
+    encoding: Optional[str] = None
+) -> List[TextFileData]:
+    """
+    複数のテキストファイルをプロセスプールで並列に読み込む
+
+    デコードや統計カウントはGILに縛られるため、大量のファイルを
+    一括で取り込む場合はスレッドではなくプロセスで並列化する。
+    asyncコンテキストからI/O待ちを重ねたいだけの場合は
+    read_text_files_asyncを使う。
+
+    Args:
+        file_paths: テキストファイルのパスのリスト
+        workers: ワーカープロセス数（Noneの場合はCPUコア数）
+        encoding: エンコーディング（Noneの場合は自動検出）
+
+    Returns:
+        テキストファイルデータのリスト（file_pathsと同じ順序）
+    """
+    batch_ts = datetime.now().isoformat()
+
+    # プロセス生成コストが見合わない件数は直列で処理する
+    if len(file_paths) <= 1:
+        return [read_text_file(p, encoding, batch_ts) for p in file_paths]
+
+    reader = functools.partial(read_text_file, encoding=encoding, extracted_at=batch_ts)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        return list(executor.map(reader, file_paths, chunksize=16))
+
+
 def read_text_file_simple(file_path: str, encoding: Optional[str] = None) -> str:
     """
     テキストファイルを読み込んで、シンプルな文字列として返す
@@ -213,8 +504,8 @@ def read_text_file_simple(file_path: str, encoding: Optional[str] = None) -> str
         FileNotFoundError: ファイルが存在しない場合
         ValueError: テキストファイルとして読み込めない場合
     """
-    text_data = read_text_file(file_path, encoding)
-    return text_data.content
+    content, _, _ = _read_raw(file_path, encoding)
+    return content
 
 
 def read_text_file_lines(file_path: str, encoding: Optional[str] = None) -> List[str]:
@@ -232,12 +523,147 @@ def read_text_file_lines(file_path: str, encoding: Optional[str] = None) -> List
         FileNotFoundError: ファイルが存在しない場合
         ValueError: テキストファイルとして読み込めない場合
     """
-    text_data = read_text_file(file_path, encoding)
-    return text_data.content.splitlines()
+    content, _, _ = _read_raw(file_path, encoding)
+    return content.splitlines()
+
+
+# numbaが利用できる場合のみ、チャンク境界計算をJITコンパイルした
+# ループに差し替える（JITなしでnumpy配列をPythonループで舐めると
+# かえって遅くなるため、numbaがない環境では通常パスを使う）
+_chunk_cutpoints = None
+try:
+    import numba
+    import numpy as _np
+
+    @numba.njit(cache=True)
+    def _chunk_cutpoints(line_offsets, content_len, chunk_size, last_unterminated):
+        """
+        行開始オフセット配列からチャンク境界を計算
+
+        戻り値は各チャンクの
+        (開始行, 終了行, 開始オフセット, 終了オフセット, 文字数) の行列。
+        """
+        n = line_offsets.shape[0]
+        result = _np.empty((n, 5), dtype=_np.int64)
+        count = 0
+        chunk_start = 0
+        chunk_start_line = 0
+
+        for i in range(n):
+            line_start = line_offsets[i]
+            if i + 1 < n:
+                line_len = line_offsets[i + 1] - line_start
+            else:
+                line_len = content_len - line_start + (1 if last_unterminated else 0)
+
+            if chunk_start < line_start and (line_start - chunk_start) + line_len > chunk_size:
+                result[count, 0] = chunk_start_line
+                result[count, 1] = i - 1
+                result[count, 2] = chunk_start
+                result[count, 3] = line_start
+                result[count, 4] = line_start - chunk_start
+                count += 1
+                chunk_start = line_start
+                chunk_start_line = i
+
+        if chunk_start < content_len:
+            result[count, 0] = chunk_start_line
+            result[count, 1] = n - 1
+            result[count, 2] = chunk_start
+            result[count, 3] = content_len
+            result[count, 4] = content_len - chunk_start + (1 if last_unterminated else 0)
+            count += 1
+
+        return result[:count]
+except ImportError:
+    pass
+
+
+def _iter_lines(content: str):
+    """
+    行リストを実体化せずに各行の位置を順に返すジェネレータ
+
+    splitlines()はcontentと同量の文字列オブジェクトを新たに確保する
+    ため、行の位置だけが必要な処理ではこちらを使う。
+
+    Args:
+        content: 対象の文字列
+
+    Yields:
+        (行番号, 開始オフセット, 終了オフセット) のタプル。
+        終了オフセットは改行の次の位置（最終行が未終端の場合は末尾）
+    """
+    content_len = len(content)
+    line_idx = 0
+    line_start = 0
+    while line_start < content_len:
+        newline_pos = content.find("\n", line_start)
+        line_end = newline_pos + 1 if newline_pos != -1 else content_len
+        yield line_idx, line_start, line_end
+        line_idx += 1
+        line_start = line_end
+
+
+def _compute_chunk_rows(content: str, content_len: int, chunk_size: int):
+    """
+    チャンク境界を計算する
+
+    行リストや文字列連結を使わず、content内のオフセットを歩いて
+    境界だけを決める（スライスは呼び出し側がチャンク確定時に1回行う）。
+    numbaが使える環境ではJITコンパイル済みのループで計算する。
+
+    Args:
+        content: ファイル内容
+        content_len: contentの文字数
+        chunk_size: チャンクサイズ（文字数）
+
+    Returns:
+        各チャンクの (開始行, 終了行, 開始オフセット, 終了オフセット, 文字数)
+        の並び。最終チャンクは空白のみでも含まれるため、呼び出し側で除外する
+    """
+    if _chunk_cutpoints is not None:
+        # 各行の開始オフセットを収集し、境界判定はJIT関数に任せる
+        offsets = [0]
+        pos = content.find("\n")
+        while pos != -1 and pos + 1 < content_len:
+            offsets.append(pos + 1)
+            pos = content.find("\n", pos + 1)
+        last_unterminated = bool(content) and not content.endswith("\n")
+        return _chunk_cutpoints(
+            _np.asarray(offsets, dtype=_np.int64),
+            content_len,
+            chunk_size,
+            last_unterminated
+        )
+
+    last_unterminated = bool(content) and not content.endswith("\n")
+
+    rows = []
+    chunk_start = 0       # 現在のチャンクの開始オフセット
+    chunk_start_line = 0  # 現在のチャンクの開始行番号
+
+    for line_idx, line_start, line_end in _iter_lines(content):
+        # 行長は改行込みで数える（最終行に改行がない場合も+1して従来と揃える）
+        line_len = line_end - line_start
+        if line_end == content_len and last_unterminated:
+            line_len += 1
+
+        if chunk_start < line_start and (line_start - chunk_start) + line_len > chunk_size:
+            rows.append((chunk_start_line, line_idx - 1, chunk_start, line_start,
+                         line_start - chunk_start))
+            chunk_start = line_start
+            chunk_start_line = line_idx
+
+    # 最後のチャンク
+    if chunk_start < content_len:
+        char_count = content_len - chunk_start + (1 if last_unterminated else 0)
+        rows.append((chunk_start_line, line_idx, chunk_start, content_len, char_count))
+
+    return rows
 
 
 def extract_text_to_chunks(
-    file_path: str, 
+    file_path: str,
     chunk_size: int = 1000,
     encoding: Optional[str] = None
 ) -> List[TextChunkData]:
@@ -252,47 +678,79 @@ def extract_text_to_chunks(
     Returns:
         チャンクのリスト
     """
-    text_data = read_text_file(file_path, encoding)
-    lines = text_data.content.splitlines()
-    
+    content, _, _ = _read_raw(file_path, encoding)
+    content_len = len(content)
+
     chunks = []
     chunk_id = 0
-    current_chunk = ""
-    current_chunk_lines = []
-    line_start = 0
-    
-    for line_idx, line in enumerate(lines):
-        line_text = line + "\n"  # 改行を含める
-        
-        if len(current_chunk) + len(line_text) > chunk_size and current_chunk:
-            # チャンクを保存
-            chunks.append(TextChunkData(
-                chunk_id=chunk_id,
-                line_start=line_start,
-                line_end=line_idx - 1,
-                text=current_chunk.rstrip(),
-                char_count=len(current_chunk)
-            ))
-            chunk_id += 1
-            current_chunk = ""
-            line_start = line_idx
-        
-        current_chunk += line_text
-        current_chunk_lines.append(line_idx)
-    
-    # 最後のチャンクを保存
-    if current_chunk.strip():
+    for start_line, end_line, start_off, end_off, char_count in \
+            _compute_chunk_rows(content, content_len, chunk_size):
+        text = content[start_off:end_off]
+        # 最終チャンクが空白のみの場合はスキップ
+        if end_off == content_len and not text.strip():
+            continue
         chunks.append(TextChunkData(
             chunk_id=chunk_id,
-            line_start=line_start,
-            line_end=len(lines) - 1,
-            text=current_chunk.rstrip(),
-            char_count=len(current_chunk)
+            line_start=int(start_line),
+            line_end=int(end_line),
+            text=text.rstrip(),
+            char_count=int(char_count)
         ))
-    
+        chunk_id += 1
+
     return chunks
 
 
+def extract_text_to_chunks_fast(
+    file_path: str,
+    chunk_size: int = 1000,
+    encoding: Optional[str] = None
+) -> TextChunkBatch:
+    """
+    テキストファイルをSoA表現のチャンクバッチとして抽出
+
+    チャンク数が多い場合、チャンクごとのモデル生成とフィールドごとの
+    Pythonオブジェクト保持が支配的になるため、整数列はnumpy配列に
+    まとめて保持する。個々のチャンクが必要な場合は添字アクセスで
+    TextChunkDataとして実体化できる。
+
+    Args:
+        file_path: テキストファイルのパス
+        chunk_size: チャンクサイズ（文字数）
+        encoding: エンコーディング（Noneの場合は自動検出）
+
+    Returns:
+        チャンクバッチ（SoA表現）
+    """
+    import numpy as np
+
+    content, _, _ = _read_raw(file_path, encoding)
+    content_len = len(content)
+
+    line_starts = []
+    line_ends = []
+    char_counts = []
+    texts = []
+    for start_line, end_line, start_off, end_off, char_count in \
+            _compute_chunk_rows(content, content_len, chunk_size):
+        text = content[start_off:end_off]
+        # 最終チャンクが空白のみの場合はスキップ
+        if end_off == content_len and not text.strip():
+            continue
+        line_starts.append(start_line)
+        line_ends.append(end_line)
+        char_counts.append(char_count)
+        texts.append(text.rstrip())
+
+    return TextChunkBatch.model_construct(
+        chunk_ids=np.arange(len(texts), dtype=np.int64),
+        line_starts=np.asarray(line_starts, dtype=np.int64),
+        line_ends=np.asarray(line_ends, dtype=np.int64),
+        char_counts=np.asarray(char_counts, dtype=np.int64),
+        texts=texts
+    )
+
+
 def read_text_file_by_lines(
     file_path: str,
     start_line: int = 0,
@@ -315,18 +773,24 @@ def read_text_file_by_lines(
         FileNotFoundError: ファイルが存在しない場合
         ValueError: テキストファイルとして読み込めない場合
     """
-    lines = read_text_file_lines(file_path, encoding)
-    
-    if end_line is None:
-        end_line = len(lines)
-    
     # 範囲をチェック
     start_line = max(0, start_line)
-    end_line = min(len(lines), end_line)
-    
-    if start_line >= end_line:
+    if end_line is not None and start_line >= end_line:
         return ""
-    
-    selected_lines = lines[start_line:end_line]
-    return "\n".join(selected_lines)
+
+    if encoding is None:
+        encoding = detect_encoding(file_path)
+
+    # ファイル全体をメモリに載せず、必要な行範囲だけをストリーミングで
+    # 読み出す（end_lineに達した時点で読み込みを打ち切る）
+    try:
+        with open(file_path, 'r', encoding=encoding, buffering=1 << 16) as f:
+            text = "".join(itertools.islice(f, start_line, end_line))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
+    except UnicodeDecodeError:
+        raise ValueError(f"ファイルをテキストとして読み込めません: {file_path}")
+
+    # 行間の改行は保持し、末尾の改行のみ除去（従来のjoin結果と揃える）
+    return text[:-1] if text.endswith("\n") else text
 
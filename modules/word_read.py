@@ -1,9 +1,12 @@
 """Wordファイル読み込みとテキスト抽出モジュール"""
+import functools
 import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class WordParagraphData(BaseModel):
@@ -41,8 +44,8 @@ class WordFileData(BaseModel):
     word_count: int = Field(..., ge=0, description="単語数")
     extracted_at: str = Field(..., description="抽出日時（ISO形式）")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "file_path": "/path/to/file.docx",
                 "filename": "file.docx",
@@ -55,15 +58,82 @@ class WordFileData(BaseModel):
                 "extracted_at": "2024-01-01T00:00:00"
             }
         }
+    )
 
 
-def read_word_file(file_path: str) -> WordFileData:
+# docx.Documentのキャッシュ: (絶対パス, mtime_ns, サイズ) -> Document
+# .docxのzip展開とXMLパースは重いため、メタ情報取得→チャンク抽出のような
+# 連続アクセスでの再パースを省く
+_doc_cache = OrderedDict()
+_DOC_CACHE_MAX = 32
+
+
+@functools.lru_cache(maxsize=1)
+def _get_document_class():
+    """
+    docx.Documentクラスを取得（初回のみインポートして以降はキャッシュ）
+
+    python-docxのインポートはlxml読み込みを伴い重いため、
+    モジュール読み込み時ではなく最初に必要になった時点で行う。
+
+    Returns:
+        docx.Documentクラス
+
+    Raises:
+        ImportError: python-docxがインストールされていない場合
+    """
+    try:
+        from docx import Document
+    except ImportError:
+        raise ImportError("python-docxが必要です。'pip install python-docx'でインストールしてください。")
+    return Document
+
+
+def _open_doc(file_path: str, st: os.stat_result = None):
+    """
+    キャッシュされたdocx.Documentを取得
+
+    キーにmtime_nsとサイズを含めるため、ファイルが更新されると
+    自動的に再パースされる。
+
+    Args:
+        file_path: Wordファイルのパス
+        st: 取得済みのstat結果（Noneの場合はここでstatを発行）
+
+    Returns:
+        docx.Documentオブジェクト
+    """
+    Document = _get_document_class()
+
+    if st is None:
+        st = os.stat(file_path)
+    key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+    doc = _doc_cache.get(key)
+    if doc is not None:
+        _doc_cache.move_to_end(key)
+        return doc
+
+    doc = Document(file_path)
+    _doc_cache[key] = doc
+    if len(_doc_cache) > _DOC_CACHE_MAX:
+        _doc_cache.popitem(last=False)
+    return doc
+
+
+def clear_word_cache():
+    """キャッシュ中のDocumentをすべて破棄（長時間稼働プロセス用）"""
+    _doc_cache.clear()
+
+
+def read_word_file(file_path: str, extracted_at: Optional[str] = None) -> WordFileData:
     """
     Wordファイルを読み込んでテキスト情報を抽出
-    
+
     Args:
         file_path: Wordファイルのパス
-        
+        extracted_at: 抽出日時（ISO形式）。一括取り込みでは呼び出し側で
+            1回だけ生成して渡すことでdatetime.now()の繰り返しを省ける
+
     Returns:
         抽出されたテキスト情報のPydanticモデル
         
@@ -71,14 +141,15 @@ def read_word_file(file_path: str) -> WordFileData:
         FileNotFoundError: ファイルが存在しない場合
         ValueError: ファイルがWord形式でない場合
     """
-    try:
-        from docx import Document
-    except ImportError:
-        raise ImportError("python-docxが必要です。'pip install python-docx'でインストールしてください。")
+    # 依存の有無を先に確認（未インストールなら分かりやすいエラーを送出）
+    _get_document_class()
     
     path = Path(file_path)
     
-    if not path.exists():
+    # statは1回だけ発行し、存在確認とDocumentキャッシュのキー生成を兼ねる
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
     
     if not path.suffix.lower() in ['.docx', '.doc']:
@@ -86,7 +157,7 @@ def read_word_file(file_path: str) -> WordFileData:
     
     try:
         # Wordファイルを読み込む
-        doc = Document(file_path)
+        doc = _open_doc(file_path, st)
         
         # 段落データを抽出
         paragraphs_data = []
@@ -95,7 +166,8 @@ def read_word_file(file_path: str) -> WordFileData:
         for idx, paragraph in enumerate(doc.paragraphs):
             text = paragraph.text.strip()
             if text:  # 空でない段落のみ追加
-                paragraphs_data.append(WordParagraphData(
+                # ループ内で大量生成するためバリデーションを省いて構築
+                paragraphs_data.append(WordParagraphData.model_construct(
                     paragraph_index=idx,
                     text=text,
                     style=paragraph.style.name if paragraph.style else None,
@@ -113,10 +185,11 @@ def read_word_file(file_path: str) -> WordFileData:
             
             for row_idx, row in enumerate(table.rows):
                 cells = [cell.text.strip() for cell in row.cells]
-                cells_text = " | ".join([cell for cell in cells if cell])
+                # filter(None, ...)はC実装のイテレータで中間リストを作らない
+                cells_text = " | ".join(filter(None, cells))
                 
                 if cells_text:  # 空行でない場合のみ追加
-                    rows_data.append(WordTableRowData(
+                    rows_data.append(WordTableRowData.model_construct(
                         row_index=row_idx,
                         cells=cells
                     ))
@@ -124,7 +197,7 @@ def read_word_file(file_path: str) -> WordFileData:
             
             if rows_data:
                 table_text = " | ".join(table_full_text)
-                tables_data.append(WordTableData(
+                tables_data.append(WordTableData.model_construct(
                     table_index=table_idx,
                     row_count=len(rows_data),
                     column_count=len(table.columns),
@@ -137,7 +210,8 @@ def read_word_file(file_path: str) -> WordFileData:
         all_texts = paragraph_texts + table_texts
         full_text = "\n".join(all_texts)
         
-        return WordFileData(
+        # すべて内部で計算した値のため、バリデーションを省いて構築する
+        return WordFileData.model_construct(
             file_path=str(path.absolute()),
             filename=path.name,
             paragraph_count=len(paragraphs_data),
@@ -146,34 +220,118 @@ def read_word_file(file_path: str) -> WordFileData:
             tables=tables_data,
             full_text=full_text,
             word_count=len(full_text.split()) if full_text else 0,
-            extracted_at=datetime.now().isoformat()
+            extracted_at=extracted_at if extracted_at is not None else datetime.now().isoformat()
         )
     except Exception as e:
         raise ValueError(f"Wordファイルの読み込みエラー: {str(e)}")
 
 
-def read_word_simple(file_path: str) -> str:
+def _warm_worker():
+    """ワーカープロセス起動時にpython-docxを先読みする（初回タスクの遅延を平準化）"""
+    try:
+        _get_document_class()
+    except ImportError:
+        pass  # 未インストールの場合は各タスク側でエラーを送出する
+
+
+def read_many_word(
+    file_paths: List[str],
+    workers: Optional[int] = None
+) -> List[WordFileData]:
+    """
+    複数のWordファイルをプロセスプールで並列に読み込む
+
+    .docxのzip展開・XMLパース・オブジェクト構築はCPUバウンドで
+    GILに縛られるため、ファイル単位でプロセスに振り分ける。
+
+    Args:
+        file_paths: Wordファイルのパスのリスト
+        workers: ワーカープロセス数（Noneの場合はCPUコア数）
+
+    Returns:
+        抽出されたテキスト情報のリスト（file_pathsと同じ順序）
+    """
+    # 抽出日時はバッチごとに1回だけ生成して全ファイルで共有する
+    batch_ts = datetime.now().isoformat()
+
+    # プロセス生成コストが見合わない件数は直列で処理する
+    if len(file_paths) <= 1:
+        return [read_word_file(p, batch_ts) for p in file_paths]
+
+    reader = functools.partial(read_word_file, extracted_at=batch_ts)
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_warm_worker
+    ) as executor:
+        return list(executor.map(reader, file_paths, chunksize=4))
+
+
+# WordprocessingMLの名前空間
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _read_word_texts_lxml(file_path: str) -> List[str]:
+    """
+    word/document.xmlをlxmlで直接パースして段落テキストを抽出
+
+    python-docxのオブジェクトモデルは段落・ラン・セルごとにPython
+    オブジェクトを生成し、プロパティアクセスのたびにXMLを再問い合わせ
+    する。テキストだけが必要な一括抽出では、libxml2のC実装で
+    w:tノードを直接集める方が大幅に速い。
+
+    Args:
+        file_path: Wordファイルのパス
+
+    Returns:
+        空でない段落テキストのリスト（テーブル内の段落も含む）
+    """
+    import zipfile
+    from lxml import etree
+
+    with zipfile.ZipFile(file_path) as z:
+        root = etree.fromstring(z.read("word/document.xml"))
+
+    run_text = etree.XPath(".//w:t/text()", namespaces={"w": _W_NS})
+
+    texts = []
+    for paragraph in root.iter(f"{{{_W_NS}}}p"):
+        text = "".join(run_text(paragraph)).strip()
+        if text:
+            texts.append(text)
+    return texts
+
+
+def read_word_simple(file_path: str, fast: bool = False) -> str:
     """
     Wordファイルを読み込んで、シンプルなテキスト文字列として返す
-    
+
     Args:
         file_path: Wordファイルのパス
-        
+        fast: lxmlでXMLを直接パースする高速モード
+              （テーブルは段落として平坦化され、"=== Table ==="区切りは付かない）
+
     Returns:
         抽出されたテキスト（改行区切り）
     """
-    try:
-        from docx import Document
-    except ImportError:
-        raise ImportError("python-docxが必要です。'pip install python-docx'でインストールしてください。")
-    
+    # 依存の有無を先に確認（未インストールなら分かりやすいエラーを送出）
+    _get_document_class()
+
     path = Path(file_path)
-    
-    if not path.exists():
+
+    # statは1回だけ発行し、存在確認とDocumentキャッシュのキー生成を兼ねる
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
-    
+
+    if fast:
+        try:
+            return "\n".join(_read_word_texts_lxml(file_path))
+        except ImportError:
+            pass  # lxmlがなければ通常パスにフォールバック
+
     try:
-        doc = Document(file_path)
+        doc = _open_doc(file_path, st)
         texts = []
         
         # 段落のテキスト
@@ -186,8 +344,8 @@ def read_word_simple(file_path: str) -> str:
         for table in doc.tables:
             table_texts = []
             for row in table.rows:
-                cells = [cell.text.strip() for cell in row.cells]
-                row_text = " | ".join([cell for cell in cells if cell])
+                # stripとフィルタを1パスに融合（中間リストなし）
+                row_text = " | ".join(s for s in (c.text.strip() for c in row.cells) if s)
                 if row_text:
                     table_texts.append(row_text)
             if table_texts:
@@ -209,30 +367,39 @@ def get_word_metadata(file_path: str) -> Dict[str, Any]:
     Returns:
         メタ情報の辞書
     """
-    try:
-        from docx import Document
-    except ImportError:
-        raise ImportError("python-docxが必要です。'pip install python-docx'でインストールしてください。")
+    # 依存の有無を先に確認（未インストールなら分かりやすいエラーを送出）
+    _get_document_class()
     
     path = Path(file_path)
     
-    if not path.exists():
+    # statは1回だけ発行し、存在確認とDocumentキャッシュのキー生成を兼ねる
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
     
     try:
         # ファイルを開いてメタ情報のみ取得
-        doc = Document(file_path)
+        doc = _open_doc(file_path, st)
         
-        # 段落とテーブルの数をカウント
-        paragraph_count = len([p for p in doc.paragraphs if p.text.strip()])
+        # 段落数のカウントと見出し判定を1パスに融合する
+        # （中間リストを作らず、スタイル名の解決はhas_headers確定まで）
+        paragraph_count = 0
+        has_headers = False
+        for p in doc.paragraphs:
+            text = p.text
+            if text and not text.isspace():
+                paragraph_count += 1
+            if not has_headers and p.style.name.startswith('Heading'):
+                has_headers = True
         table_count = len(doc.tables)
-        
+
         return {
             "file_path": str(path.absolute()),
             "filename": path.name,
             "paragraph_count": paragraph_count,
             "table_count": table_count,
-            "has_headers": any(p.style.name.startswith('Heading') for p in doc.paragraphs),
+            "has_headers": has_headers,
             "has_footers": len(doc.sections[0].footer.paragraphs) > 0 if doc.sections else False,
             "has_headers_footers": len(doc.sections[0].header.paragraphs) > 0 if doc.sections else False
         }
@@ -251,82 +418,77 @@ def extract_word_to_chunks(file_path: str, chunk_size: int = 1000) -> List[Dict[
     Returns:
         チャンクのリスト
     """
-    try:
-        from docx import Document
-    except ImportError:
-        raise ImportError("python-docxが必要です。'pip install python-docx'でインストールしてください。")
+    # 依存の有無を先に確認（未インストールなら分かりやすいエラーを送出）
+    _get_document_class()
     
     path = Path(file_path)
     
-    if not path.exists():
+    # statは1回だけ発行し、存在確認とDocumentキャッシュのキー生成を兼ねる
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
     
-    doc = Document(file_path)
+    doc = _open_doc(file_path, st)
     chunks = []
     chunk_id = 0
-    
-    current_chunk = ""
+
+    # 文字列の+=はO(n^2)になるため、リストに貯めてフラッシュ時にjoinする
+    buf = []
+    buf_len = 0
     current_chunk_paragraphs = []
-    
+
+    def _flush():
+        """現在のバッファをチャンクとして保存"""
+        nonlocal chunk_id, buf, buf_len, current_chunk_paragraphs
+        current_chunk = "".join(buf)
+        chunks.append({
+            "chunk_id": chunk_id,
+            "type": "paragraph",
+            "paragraph_start": current_chunk_paragraphs[0] if current_chunk_paragraphs else 0,
+            "paragraph_end": current_chunk_paragraphs[-1] if current_chunk_paragraphs else 0,
+            "text": current_chunk.strip(),
+            "char_count": len(current_chunk)
+        })
+        chunk_id += 1
+        buf = []
+        buf_len = 0
+        current_chunk_paragraphs = []
+
     # 段落を処理
     for para_idx, paragraph in enumerate(doc.paragraphs):
         text = paragraph.text.strip()
         if not text:
             continue
-        
-        if len(current_chunk) + len(text) > chunk_size and current_chunk:
-            # チャンクを保存
-            chunks.append({
-                "chunk_id": chunk_id,
-                "type": "paragraph",
-                "paragraph_start": current_chunk_paragraphs[0] if current_chunk_paragraphs else para_idx,
-                "paragraph_end": current_chunk_paragraphs[-1] if current_chunk_paragraphs else para_idx,
-                "text": current_chunk.strip(),
-                "char_count": len(current_chunk)
-            })
-            chunk_id += 1
-            current_chunk = ""
-            current_chunk_paragraphs = []
-        
-        current_chunk += text + "\n"
+
+        if buf_len + len(text) > chunk_size and buf:
+            _flush()
+
+        buf.append(text + "\n")
+        buf_len += len(text) + 1
         current_chunk_paragraphs.append(para_idx)
-    
+
     # テーブルを処理
     for table_idx, table in enumerate(doc.tables):
-        table_text = ""
+        table_parts = []
         for row in table.rows:
-            cells = [cell.text.strip() for cell in row.cells]
-            row_text = " | ".join([cell for cell in cells if cell])
+            # stripとフィルタを1パスに融合（中間リストなし）
+            row_text = " | ".join(s for s in (c.text.strip() for c in row.cells) if s)
             if row_text:
-                table_text += row_text + "\n"
-        
-        if table_text:
-            if len(current_chunk) + len(table_text) > chunk_size and current_chunk:
-                # 現在のチャンクを保存
-                chunks.append({
-                    "chunk_id": chunk_id,
-                    "type": "paragraph",
-                    "paragraph_start": current_chunk_paragraphs[0] if current_chunk_paragraphs else 0,
-                    "paragraph_end": current_chunk_paragraphs[-1] if current_chunk_paragraphs else 0,
-                    "text": current_chunk.strip(),
-                    "char_count": len(current_chunk)
-                })
-                chunk_id += 1
-                current_chunk = ""
-                current_chunk_paragraphs = []
-            
-            current_chunk += f"=== Table {table_idx} ===\n{table_text}"
-    
+                table_parts.append(row_text + "\n")
+
+        if table_parts:
+            table_text = "".join(table_parts)
+            if buf_len + len(table_text) > chunk_size and buf:
+                _flush()
+
+            piece = f"=== Table {table_idx} ===\n{table_text}"
+            buf.append(piece)
+            buf_len += len(piece)
+
     # 最後のチャンクを保存
-    if current_chunk.strip():
-        chunks.append({
-            "chunk_id": chunk_id,
-            "type": "paragraph",
-            "paragraph_start": current_chunk_paragraphs[0] if current_chunk_paragraphs else 0,
-            "paragraph_end": current_chunk_paragraphs[-1] if current_chunk_paragraphs else 0,
-            "text": current_chunk.strip(),
-            "char_count": len(current_chunk)
-        })
-    
+    if buf and "".join(buf).strip():
+        _flush()
+
     return chunks
 
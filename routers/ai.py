@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+import asyncio
+
+import orjson
+from fastapi import APIRouter, Response
+from fastapi.responses import StreamingResponse
 from pydantic_core.core_schema import ModelSchema
 
 router = APIRouter(
@@ -6,6 +10,9 @@ router = APIRouter(
     tags=["ai"]
 )
 
+# SSEのキープアライブ間隔（秒）
+SSE_KEEPALIVE_INTERVAL = 21
+
 MODELS = [
     {
         "id": "qwen/qwen3-embedding-8b",
@@ -29,9 +36,33 @@ MODELS = [
     }
 ]
 
+# MODELSは定数のため、レスポンスのJSONはモジュール読み込み時に1回だけ生成する
+_MODELS_JSON = orjson.dumps({"models": MODELS})
+
+
 @router.get("/models")
 async def get_models():
     """AIモデル一覧を取得"""
-    return {"models": MODELS}
+    # リクエストごとのシリアライズを省き、事前生成したJSONをそのまま返す
+    return Response(content=_MODELS_JSON, media_type="application/json")
+
+
+async def _models_event_stream():
+    """AIモデル一覧をSSEフレームとして送信するジェネレータ"""
+    event_id = 0
+    yield f"id: {event_id}\ndata: {_MODELS_JSON.decode()}\n\n"
+    while True:
+        # 接続維持のためのコメント行（クライアント側では無視される）
+        await asyncio.sleep(SSE_KEEPALIVE_INTERVAL)
+        yield ": keep-alive\n\n"
+
+
+@router.get("/models/stream")
+async def stream_models():
+    """AIモデル一覧をServer-Sent Eventsで配信（1接続でプッシュ更新）"""
+    return StreamingResponse(
+        _models_event_stream(),
+        media_type="text/event-stream"
+    )
 
 
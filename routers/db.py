@@ -1,6 +1,5 @@
 from fastapi import APIRouter, HTTPException
 from database import get_db_connection, DB_DIR
-import lancedb
 from lancedb.pydantic import LanceModel, Vector
 from datetime import datetime
 
@@ -1,4 +1,8 @@
+import asyncio
+import json
+
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
 router = APIRouter(
@@ -6,6 +10,9 @@ router = APIRouter(
     tags=["items"]
 )
 
+# SSEのキープアライブ間隔（秒）
+SSE_KEEPALIVE_INTERVAL = 21
+
 
 @router.get("/")
 async def list_items(skip: int = 0, limit: int = 10):
@@ -18,6 +25,26 @@ async def list_items(skip: int = 0, limit: int = 10):
     }
 
 
+async def _items_event_stream():
+    """アイテム一覧をSSEフレームとして送信するジェネレータ"""
+    event_id = 0
+    payload = {"items": [], "skip": 0, "limit": 10, "total": 0}
+    yield f"id: {event_id}\ndata: {json.dumps(payload)}\n\n"
+    while True:
+        # 接続維持のためのコメント行（クライアント側では無視される）
+        await asyncio.sleep(SSE_KEEPALIVE_INTERVAL)
+        yield ": keep-alive\n\n"
+
+
+@router.get("/stream")
+async def stream_items():
+    """アイテム一覧をServer-Sent Eventsで配信（1接続でプッシュ更新）"""
+    return StreamingResponse(
+        _items_event_stream(),
+        media_type="text/event-stream"
+    )
+
+
 @router.get("/{item_id}")
 async def read_item(item_id: int, q: Optional[str] = Query(None)):
     """アイテムを取得する"""
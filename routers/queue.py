@@ -1,14 +1,27 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+
+import orjson
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Body
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 from pydantic import BaseModel
-from sqlite_db import get_sqlite_connection
+from sqlite_db import get_read_connection, get_write_connection
 import sqlite3
 
 
+log = logging.getLogger(__name__)
+
+
+# orjsonでシリアライズすることで、行数の多いレスポンスのJSON化コストを下げる
+# （ストリーミング版はorjsonを直接使用。アプリ既定と重ねてルータ単位でも明示）
 router = APIRouter(
     prefix="/queue",
-    tags=["queue"]
+    tags=["queue"],
+    default_response_class=ORJSONResponse
 )
 
 
@@ -18,88 +31,302 @@ class EnqueueRequest(BaseModel):
     priority: int = Body(0, description="優先度（高い方が先に処理）")
 
 
+# SQLはモジュール定数として1回だけ定義する。sqlite3は同一テキストの
+# ステートメントを接続ごとの内部キャッシュで再利用するため、
+# リクエストごとの再パース・再プランを省ける
+
+# fieldsパラメータで返却可能な列のホワイトリスト。
+# SQLに連結されるのはこの定数に含まれる検証済みの列名のみ
+QUEUE_COLUMNS = (
+    "id", "file_path", "status", "priority", "retry_count",
+    "error_message", "file_hash", "metadata",
+    "created_at", "updated_at", "started_at", "completed_at"
+)
+_QUEUE_COLUMN_SET = frozenset(QUEUE_COLUMNS)
+
+# 既定の絞り込み射影。error_messageやmetadataのような大きくなりがちな
+# 列は要求されたときだけ読み出す（行のオーバーフローページ読み込みと
+# シリアライズ量を削減する）
+DEFAULT_QUEUE_COLUMNS = ("id", "file_path", "status", "priority", "created_at")
+
+
+@functools.lru_cache(maxsize=32)
+def _build_list_sql(columns: tuple) -> str:
+    """列射影付きの一覧取得SQLを組み立てる（列セットごとにキャッシュ）
+
+    同じ列セットは同一のSQLテキストになるため、sqlite3の
+    ステートメントキャッシュも引き続き有効に働く。
+    """
+    return (
+        f"SELECT {', '.join(columns)} "
+        "FROM file_processing_queue "
+        "ORDER BY priority DESC, created_at ASC "
+        "LIMIT ? OFFSET ?"
+    )
+
+
+SQL_STREAM_QUEUE = """
+    SELECT id, file_path, status, priority, retry_count,
+           created_at, updated_at, started_at, completed_at
+    FROM file_processing_queue
+    ORDER BY priority DESC, created_at ASC
+"""
+
+SQL_COUNT_QUEUE = "SELECT COUNT(*) FROM file_processing_queue"
+
+# created_at/updated_atはSQLite側のCURRENT_TIMESTAMPで記録する。
+# Python側のdatetime生成・ISO整形・TEXTバインドを省き、
+# 形式がDB内で統一されるためORDER BY時の比較も一様になる。
+# 重複登録はON CONFLICT DO NOTHINGで静かに弾き、RETURNINGの有無で
+# 判定する（IntegrityError例外の生成・巻き戻しコストを踏まない）
+SQL_INSERT_QUEUE = """
+    INSERT INTO file_processing_queue
+    (file_path, status, priority, retry_count, error_message,
+     file_hash, metadata, created_at, updated_at, started_at, completed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, ?, ?)
+    ON CONFLICT(file_path) DO NOTHING
+    RETURNING id
+"""
+
+# executemanyはRETURNINGと併用できないため、バッチ用は従来のINSERTのまま
+SQL_INSERT_QUEUE_BATCH = """
+    INSERT INTO file_processing_queue
+    (file_path, status, priority, retry_count, error_message,
+     file_hash, metadata, created_at, updated_at, started_at, completed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, ?, ?)
+"""
+
+
+# /queue_listの短命キャッシュ。ポーリングで連続アクセスされる一覧は
+# TTL内なら同一のシリアライズ済みバイト列をそのまま返してよい。
+# 書き込み側はversionを進めてキャッシュを即時無効化する
+_LIST_CACHE_TTL = 0.5
+_list_cache = {"version": 0, "key": None, "payload": None, "ts": 0.0}
+_list_cache_lock = threading.Lock()
+
+
+def _bump_queue_version():
+    """キューへの書き込み後に一覧キャッシュを無効化する"""
+    with _list_cache_lock:
+        _list_cache["version"] += 1
+        _list_cache["payload"] = None
+
+
 def process_file(file_path: str):
     """ファイルを処理"""
-    print(f"ファイルを処理: {file_path}")
+    # printは行バッファ外でブロッキングI/Oになるため、
+    # レベルで抑制可能なloggingに寄せる（整形も出力時まで遅延される）
+    log.debug("ファイルを処理: %s", file_path)
     pass
 
 
 @router.get("/queue_list")
-async def get_queue_list():
-    """キュー一覧を取得"""
+async def get_queue_list(
+    limit: int = Query(100, ge=1, le=1000, description="取得する最大件数"),
+    offset: int = Query(0, ge=0, description="読み飛ばす件数"),
+    include_count: bool = Query(False, description="全体件数も集計して返すか"),
+    fields: Optional[str] = Query(
+        None,
+        description="返却する列のカンマ区切りリスト（省略時は主要列のみ）"
+    )
+):
+    """キュー一覧を取得（ページネーション・列射影付き）"""
+    if fields is None:
+        columns = DEFAULT_QUEUE_COLUMNS
+    else:
+        requested = tuple(f.strip() for f in fields.split(",") if f.strip())
+        unknown = [f for f in requested if f not in _QUEUE_COLUMN_SET]
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=400,
+                detail=f"不正なfields指定です: {fields}"
+            )
+        columns = requested
+    cache_key = (columns, limit, offset, include_count)
+    with _list_cache_lock:
+        if (
+            _list_cache["payload"] is not None
+            and _list_cache["key"] == cache_key
+            and time.monotonic() - _list_cache["ts"] < _LIST_CACHE_TTL
+        ):
+            return Response(
+                content=_list_cache["payload"],
+                media_type="application/json"
+            )
+        version = _list_cache["version"]
     try:
-        conn = get_sqlite_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, file_path, status, priority, retry_count, 
-                       created_at, updated_at, started_at, completed_at
-                FROM file_processing_queue
-                ORDER BY priority DESC, created_at ASC
-            """)
-            rows = cursor.fetchall()
-            
-            queue_list = []
-            for row in rows:
-                queue_list.append({
-                    "id": row["id"],
-                    "file_path": row["file_path"],
-                    "status": row["status"],
-                    "priority": row["priority"],
-                    "retry_count": row["retry_count"],
-                    "created_at": row["created_at"],
-                    "updated_at": row["updated_at"],
-                    "started_at": row["started_at"],
-                    "completed_at": row["completed_at"]
-                })
-            
-            return {"queue_list": queue_list, "count": len(queue_list)}
-        finally:
-            conn.close()
+        # ブロッキングするSQL実行をイベントループの外に逃がす
+        result = await asyncio.to_thread(
+            _fetch_queue_list_sync, columns, limit, offset, include_count
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"キュー一覧取得エラー: {str(e)}")
+    payload = orjson.dumps(result)
+    with _list_cache_lock:
+        # フェッチ中に書き込みが入っていたら、その古い結果はキャッシュしない
+        if _list_cache["version"] == version:
+            _list_cache.update(key=cache_key, payload=payload, ts=time.monotonic())
+    return Response(content=payload, media_type="application/json")
+
+
+def _fetch_queue_list_sync(
+    columns: tuple, limit: int, offset: int, include_count: bool
+) -> Dict[str, Any]:
+    """キュー一覧取得の同期実装（ワーカースレッドで実行される）"""
+    with get_read_connection() as conn:
+        cursor = conn.execute(_build_list_sql(columns), (limit, offset))
+        # sqlite3.Rowの__getitem__は列名の線形探索になるため、
+        # 列×N行のキー参照を避けてC実装のdict(row)で一括変換する
+        queue_list = [dict(row) for row in cursor]
+
+        response = {
+            "queue_list": queue_list,
+            "count": len(queue_list),
+            "limit": limit,
+            "offset": offset
+        }
+        # 全体件数のCOUNT(*)は全行走査になるため、要求された場合のみ実行
+        if include_count:
+            response["total_count"] = conn.execute(SQL_COUNT_QUEUE).fetchone()[0]
+
+        return response
+
+
+@router.get("/queue_list/stream")
+async def stream_queue_list():
+    """キュー一覧をJSON配列としてストリーミング配信
+
+    全行をリストに積まずに1行ずつシリアライズして送出するため、
+    件数に関係なくピークメモリは1行分に抑えられ、先頭行は
+    最終行のフェッチを待たずにクライアントへ届く。
+    """
+    def row_stream():
+        with get_read_connection() as conn:
+            # sqlite3のカーソル反復は遅延フェッチ（fetchallの全量コピーなし）
+            cursor = conn.execute(SQL_STREAM_QUEUE)
+            yield b"["
+            first = True
+            for row in cursor:
+                if first:
+                    first = False
+                else:
+                    yield b","
+                yield orjson.dumps(dict(row))
+            yield b"]"
+
+    return StreamingResponse(row_stream(), media_type="application/json")
 
 
 @router.post("/enqueue")
 async def enqueue(request: EnqueueRequest):
     """キューにファイルを追加"""
     try:
-        conn = get_sqlite_connection()
+        # ブロッキングするINSERT（コミットのI/O含む）をイベントループの外に逃がす
+        result = await asyncio.to_thread(
+            _enqueue_sync, request.file_path, request.priority
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"キュー登録エラー: {str(e)}")
+    if result is None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"ファイルは既にキューに登録されています: {request.file_path}"
+        )
+    return result
+
+
+def _enqueue_sync(file_path: str, priority: int) -> Optional[Dict[str, Any]]:
+    """キュー登録の同期実装（ワーカースレッドで実行される）
+
+    重複（file_pathのUNIQUE制約に衝突）の場合はNoneを返す。
+    """
+    with get_write_connection() as conn:
+        # 書き込みロックを先に取得し、途中でのロック昇格待ちを避ける
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            cursor = conn.cursor()
-            now = datetime.now().isoformat()
-            
-            cursor.execute("""
-                INSERT INTO file_processing_queue 
-                (file_path, status, priority, retry_count, error_message, 
-                 file_hash, metadata, created_at, updated_at, started_at, completed_at) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                request.file_path, "PENDING", request.priority, 0, None, 
-                None, None, now, now, None, None
-            ))
-            
+            row = conn.execute(SQL_INSERT_QUEUE, (
+                file_path, "PENDING", priority, 0, None,
+                None, None, None, None
+            )).fetchone()
             conn.commit()
-            queue_id = cursor.lastrowid
-            
-            return {
-                "message": "キューに登録されました",
-                "queue_id": queue_id,
-                "file_path": request.file_path,
-                "status": "PENDING",
-                "priority": request.priority
-            }
-        finally:
-            conn.close()
+        except Exception:
+            conn.rollback()
+            raise
+
+        if row is None:
+            return None
+
+        _bump_queue_version()
+        return {
+            "message": "キューに登録されました",
+            "queue_id": row["id"],
+            "file_path": file_path,
+            "status": "PENDING",
+            "priority": priority
+        }
+
+
+class EnqueueBatchRequest(BaseModel):
+    """キュー一括登録リクエストモデル"""
+    items: List[EnqueueRequest] = Body(..., description="登録するファイルのリスト")
+
+
+@router.post("/enqueue_batch")
+async def enqueue_batch(request: EnqueueBatchRequest):
+    """複数ファイルを1トランザクションでまとめてキューに追加
+
+    1件ずつ/enqueueを呼ぶとHTTP往復とコミット（fsync）を件数分払うが、
+    ここではexecutemany＋単一コミットでバッチ全体に均す。
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="itemsが空です")
+    try:
+        return await asyncio.to_thread(_enqueue_batch_sync, request.items)
     except sqlite3.IntegrityError as e:
-        raise HTTPException(status_code=400, detail=f"ファイルは既にキューに登録されています: {str(e)}")
+        # 単体の/enqueueと同じく、重複はトランザクション全体を巻き戻して409で返す
+        raise HTTPException(status_code=409, detail=f"ファイルは既にキューに登録されています: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"キュー登録エラー: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"キュー一括登録エラー: {str(e)}")
+
+
+def _enqueue_batch_sync(items: List[EnqueueRequest]) -> Dict[str, Any]:
+    """キュー一括登録の同期実装（ワーカースレッドで実行される）"""
+    with get_write_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(SQL_INSERT_QUEUE_BATCH, [
+                (it.file_path, "PENDING", it.priority, 0, None,
+                 None, None, None, None)
+                for it in items
+            ])
+            # 書き込み接続は1本のため、トランザクション内のIDは連番になる
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        _bump_queue_version()
+        return {
+            "message": "キューに一括登録されました",
+            "enqueued_count": len(items),
+            "queue_id_first": last_id - len(items) + 1,
+            "queue_id_last": last_id
+        }
 
 
 @router.post("/dequeue")
 async def dequeue(request: EnqueueRequest):
-    """キューへ登録（互換性のためのエイリアス）"""
-    # priorityを0に設定してenqueueを呼び出す
-    request.priority = 0
-    return await enqueue(request)
\ No newline at end of file
+    """キューへ登録（互換性のためのエイリアス、priorityは常に0）"""
+    # リクエストモデルを書き換えてenqueueハンドラを再入するのではなく、
+    # 共通の同期実装をpriority=0で直接呼ぶ
+    try:
+        result = await asyncio.to_thread(_enqueue_sync, request.file_path, 0)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"キュー登録エラー: {str(e)}")
+    if result is None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"ファイルは既にキューに登録されています: {request.file_path}"
+        )
+    return result
\ No newline at end of file
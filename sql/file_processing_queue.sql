@@ -1,4 +1,4 @@
-CREATE TABLE file_processing_queue (
+CREATE TABLE IF NOT EXISTS file_processing_queue (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     file_path TEXT NOT NULL UNIQUE,       -- 処理対象のファイルパス（重複登録防止）
     status TEXT NOT NULL DEFAULT 'PENDING', -- 状態管理 (詳細は後述)
@@ -14,5 +14,14 @@ CREATE TABLE file_processing_queue (
 );
 
 -- 検索・取り出しを高速化するためのインデックス
-CREATE INDEX idx_queue_status_priority ON file_processing_queue (status, priority DESC, created_at ASC);
-CREATE INDEX idx_queue_file_path ON file_processing_queue (file_path);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_queue_status_priority ON file_processing_queue (status, priority DESC, created_at ASC);
+CREATE INDEX IF NOT EXISTS idx_queue_file_path ON file_processing_queue (file_path);
+
+-- /queue_listのORDER BY (priority DESC, created_at ASC) をインデックス順走査で
+-- 返すための複合インデックス（ソートステップが不要になる）
+CREATE INDEX IF NOT EXISTS idx_fpq_priority_created ON file_processing_queue (priority DESC, created_at ASC);
+
+-- ワーカーのポーリング（status='PENDING'のみを取得）用の部分インデックス。
+-- 完了・失敗行が蓄積してもインデックスサイズはアクティブなバックログ分に
+-- 留まり、ページキャッシュに乗り続ける
+CREATE INDEX IF NOT EXISTS idx_fpq_pending ON file_processing_queue (priority DESC, created_at ASC) WHERE status = 'PENDING';
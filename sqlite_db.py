@@ -1,64 +1,213 @@
 """SQLite3接続管理モジュール"""
+import functools
+import logging
+import queue
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
+log = logging.getLogger(__name__)
+
 # データベースファイルのパス
 DB_FILE = Path("data/knowledge_tools.db")
 DB_FILE.parent.mkdir(parents=True, exist_ok=True)
 
+# 読み取りプールに常駐させる接続数
+# （SQLiteの書き込みは常に直列になるため、書き込み接続は1本で足りる）
+_READ_POOL_SIZE = 8
+
+# 接続ごとに適用するPRAGMA（プールが接続を保持するため効果が持続する）
+# - WAL: 読み取りと書き込みが互いにブロックしない
+# - synchronous=NORMAL: WALと組み合わせてコミットごとのfsyncを省く
+# - busy_timeout: ロック競合時に即エラーにせず待機する
+# - cache_size: ページキャッシュを約20MiBに拡大（負値はKiB指定）
+# - temp_store=MEMORY: 一時テーブル・ソート領域をメモリに置く
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+# journal_modeの変更は書き込み操作のため、読み取り専用接続には適用できない
+_READ_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+)
+
 
 def get_sqlite_connection():
-    """SQLite3接続を取得"""
-    conn = sqlite3.connect(str(DB_FILE))
+    """SQLite3接続（読み書き可）を新規作成（通常はプール経由で利用する）"""
+    conn = sqlite3.connect(str(DB_FILE), check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row  # 辞書形式で結果を取得できるようにする
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
-def table_exists(table_name: str) -> bool:
-    """テーブルが存在するか確認"""
-    conn = get_sqlite_connection()
+def _make_read_connection():
+    """読み取り専用接続を新規作成（URIのmode=roで誤書き込みを構造的に防ぐ）"""
+    conn = sqlite3.connect(
+        f"file:{DB_FILE}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        isolation_level=None
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in _READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+# 接続プール: リクエストごとのconnect/closeはSQLiteのページキャッシュを
+# 毎回捨てることになるため、生きた接続を使い回す。
+# 書き込み1本＋読み取りN本に分けることで、読み取りが書き込みロックの
+# 解放待ち（SQLITE_BUSYリトライ）に巻き込まれない。
+# 生成はimport時ではなくinit_pool()（FastAPIのlifespan起動時）で行う
+_write_pool: queue.Queue = queue.Queue(maxsize=1)
+_read_pool: queue.Queue = queue.Queue(maxsize=_READ_POOL_SIZE)
+_pool_lock = threading.Lock()
+_pool_ready = False
+
+
+def init_pool(read_pool_size: int = _READ_POOL_SIZE):
+    """接続プールを初期化する（アプリ起動時にlifespanから呼ぶ。冪等）"""
+    global _pool_ready, _read_pool
+    with _pool_lock:
+        if _pool_ready:
+            return
+        # 書き込み接続を先に作り、DBファイルを確実に作成してから読み取り接続を開く
+        _write_pool.put(get_sqlite_connection())
+        _read_pool = queue.Queue(maxsize=read_pool_size)
+        for _ in range(read_pool_size):
+            _read_pool.put(_make_read_connection())
+        _pool_ready = True
+
+
+def close_pool():
+    """プール内の全接続を閉じる（アプリ終了時にlifespanから呼ぶ）"""
+    global _pool_ready
+    with _pool_lock:
+        if not _pool_ready:
+            return
+        for pool in (_write_pool, _read_pool):
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+        _pool_ready = False
+
+
+@contextmanager
+def get_read_connection():
+    """読み取りプールから接続を借りて、使用後に返却するコンテキストマネージャ"""
+    # lifespan外からの利用（スクリプト・テスト）でも動くよう遅延初期化する
+    if not _pool_ready:
+        init_pool()
+    conn = _read_pool.get()
     try:
+        yield conn
+    finally:
+        _read_pool.put(conn)
+
+
+@contextmanager
+def get_write_connection():
+    """書き込み接続を借りて、使用後に返却するコンテキストマネージャ"""
+    if not _pool_ready:
+        init_pool()
+    conn = _write_pool.get()
+    try:
+        yield conn
+    finally:
+        _write_pool.put(conn)
+
+
+# 存在が確認できたテーブル名のキャッシュ
+# （プロセス内でテーブルの存在が取り消されることはない前提）
+_known_tables: set = set()
+_known_tables_lock = threading.Lock()
+
+
+def table_exists(table_name: str) -> bool:
+    """テーブルが存在するか確認（確認済みのテーブルは問い合わせを省く）"""
+    if table_name in _known_tables:
+        return True
+
+    with get_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
-            SELECT name FROM sqlite_master 
+            SELECT name FROM sqlite_master
             WHERE type='table' AND name=?
         """, (table_name,))
         result = cursor.fetchone()
-        return result is not None
-    finally:
-        conn.close()
+
+    if result is None:
+        return False
+
+    with _known_tables_lock:
+        _known_tables.add(table_name)
+    return True
+
+
+@functools.lru_cache(maxsize=32)
+def _read_sql(path: str, mtime: float) -> str:
+    """SQLファイルの内容をキャッシュ付きで読み込む
+
+    mtimeをキャッシュキーに含めることで、ファイルが更新された場合は
+    自動的に読み直される（古いエントリはLRUで追い出される）。
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
 
 
 def create_table_from_sql_file(sql_file_path: str):
     """SQLファイルからテーブルを作成"""
     sql_path = Path(sql_file_path)
-    if not sql_path.exists():
-        raise FileNotFoundError(f"SQLファイルが見つかりません: {sql_file_path}")
-    
-    with open(sql_path, 'r', encoding='utf-8') as f:
-        sql_script = f.read()
-    
-    conn = get_sqlite_connection()
     try:
-        cursor = conn.cursor()
-        # SQLスクリプトを実行（複数のステートメントに対応）
-        cursor.executescript(sql_script)
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        conn.rollback()
-        raise Exception(f"テーブル作成エラー: {str(e)}")
-    finally:
-        conn.close()
+        st = sql_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"SQLファイルが見つかりません: {sql_file_path}")
+
+    # 起動のたびに同じファイルを読み直さず、statのmtimeで鮮度を判定する
+    sql_script = _read_sql(str(sql_path), st.st_mtime)
+
+    # executescriptは実行前に暗黙のCOMMITを発行し、かつスクリプト全体が
+    # 1トランザクションにまとまらない。ステートメントに分割して自前の
+    # BEGIN〜COMMITで囲み、失敗時は全体をロールバックできるようにする
+    statements = [s.strip() for s in sql_script.split(';') if s.strip()]
+
+    with get_write_connection() as conn:
+        try:
+            if len(statements) == 1:
+                conn.execute(statements[0])
+                conn.commit()
+            else:
+                conn.execute("BEGIN")
+                for statement in statements:
+                    conn.execute(statement)
+                conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise Exception(f"テーブル作成エラー: {str(e)}")
 
 
 def ensure_table_exists(table_name: str, sql_file_path: str):
     """テーブルが存在しない場合、SQLファイルから作成"""
     if not table_exists(table_name):
-        print(f"テーブル '{table_name}' が存在しません。作成します...")
+        log.info("テーブル '%s' が存在しません。作成します...", table_name)
         create_table_from_sql_file(sql_file_path)
-        print(f"テーブル '{table_name}' を作成しました。")
+        log.info("テーブル '%s' を作成しました。", table_name)
     else:
-        print(f"テーブル '{table_name}' は既に存在します。")
-
+        # スキーマはIF NOT EXISTSで冪等のため、既存DBにも再適用して
+        # 後から追加されたインデックスを反映する
+        create_table_from_sql_file(sql_file_path)
+        log.debug("テーブル '%s' は既に存在します。", table_name)